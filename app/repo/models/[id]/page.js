@@ -629,6 +629,14 @@ const DeclareModel = ({ params }) => {
 													<span className="px-3 py-1 bg-yellow text-black rounded-full font-medium">
 														Computation timed out ⚠️
 													</span>
+												) : metric.calculationResult.redundancyChecked === false ? (
+													<span className="px-3 py-1 bg-gray text-white rounded-full font-medium">
+														{metric.calculationResult.message}
+													</span>
+												) : metric.calculationResult.complete === false ? (
+													<span className="px-3 py-1 bg-yellow text-black rounded-full font-medium">
+														{metric.calculationResult.message}
+													</span>
 												) : metric.calculationResult.redundantCount > 0 ? (
 													<span className="px-3 py-1 bg-yellow text-black rounded-full font-medium">
 														{metric.calculationResult.redundantCount} Redundant Constraints ⚠️
@@ -843,9 +843,12 @@ export default function Repo() {
 																						? "🟢"
 																						: "🔴"
 																					: headerMetric.metricID === "BH1"
-																						? metric.calculationResult.redundantCount === -1
-																							? "🟠"
-																							: metric.calculationResult.redundantCount || "0"
+																						? metric.calculationResult.redundancyChecked === false
+																							? "N/A"
+																							: metric.calculationResult.redundantCount === -1 ||
+																									metric.calculationResult.complete === false
+																								? "🟠"
+																								: metric.calculationResult.redundantCount || "0"
 																						: metric.calculationResult
 																	}
 
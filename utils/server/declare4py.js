@@ -21,7 +21,14 @@ async function runPythonCommand(modelPath) {
 				commands: [
 					"#!/bin/bash",
 					"cd /home/ubuntu/declare4py_project",
-					`timeout 30s /home/ubuntu/declare4py_project/venv/bin/python3 ltlf_checker.py --model "${modelPath}" --json-output`,
+					// Prefer the warm analyzer (ltlf_checker.py --serve --socket ...) and fall back to a cold run
+					// when it is not listening or its request fails.
+					// waitForCommandCompletion gives up after about 20s (5s + 15 polls of 1s), so the 15s
+					// deadline leaves time to report a partial result before the poller stops.
+					"if ! { [ -S /tmp/ltlf_checker.sock ] &&",
+					`curl -sf --max-time 18 --unix-socket /tmp/ltlf_checker.sock -d '{"model": "${modelPath}", "deadline": 15}' http://localhost/analyze; }; then`,
+					`timeout 18s /home/ubuntu/declare4py_project/venv/bin/python3 ltlf_checker.py --model "${modelPath}" --json-output --workers $(nproc) --deadline 15`,
+					"fi",
 				],
 			},
 		});
@@ -167,7 +174,12 @@ function parseDeclare4Py(response) {
 				message: "Model verification completed",
 				redundancy: formattedRedundancy,
 				redundancyCount: redundancyCount,
-				satisfiable: jsonResult.satisfiable || false,
+				// null when satisfiability was not decided before the deadline
+				satisfiable: jsonResult.satisfiable ?? null,
+				complete: jsonResult.complete !== false,
+				uncheckedCount: jsonResult.unchecked?.length || 0,
+				// false for inconsistent models, whose redundancy is not checked
+				redundancyChecked: jsonResult.redundancy_checked !== false,
 			};
 		}
 	} catch (error) {
@@ -0,0 +1,690 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from itertools import product
+from Declare4Py.Utils.utils import Utils
+from ltlf2dfa.parser.ltlf import LTLfParser
+from ltlf2dfa.ltlf import (
+    LTLfAlways, LTLfAnd, LTLfAtomic, LTLfEnd, LTLfEquivalence, LTLfEventually, LTLfFalse, LTLfImplies, LTLfLast,
+    LTLfNext, LTLfNot, LTLfOr, LTLfRelease, LTLfTrue, LTLfUntil, LTLfWeakNext,
+)
+from ltlf_checker import (
+    ENGINES, IMPLIED_TEMPLATES, TEMPLATE_LIBRARY, TEMPLATE_REGISTRY, Profiler, UnknownTemplateError,
+    analyze_declare_model, build_ltlf_formulas, build_template_model, format_activity_name, get_model_alphabet,
+    list_batch_models, load_declare_model, profiling
+)
+
+# Constraints that, added to a constraint of the key template over the same
+# activities (taken at the given positions), make the model unsatisfiable.
+# Templates missing here are contradicted by planting Existence and Absence of
+# one of their activities.
+TEMPLATE_CONTRADICTIONS = {
+    "Init": [("Absence", (0,))],
+    "Existence": [("Absence", (0,))],
+    "Existence2": [("Absence2", (0,))],
+    "Existence3": [("Absence3", (0,))],
+    "Absence": [("Existence", (0,))],
+    "Absence2": [("Existence2", (0,))],
+    "Absence3": [("Existence3", (0,))],
+    "Exactly1": [("Existence2", (0,))],
+    "Exactly2": [("Existence3", (0,))],
+    "Choice": [("Absence", (0,)), ("Absence", (1,))],
+    "Exclusive Choice": [("Existence", (0,)), ("Existence", (1,))],
+    "Responded Existence": [("Existence", (0,)), ("Absence", (1,))],
+    "Co-Existence": [("Existence", (0,)), ("Absence", (1,))],
+    "Response": [("Existence", (0,)), ("Absence", (1,))],
+    "Alternate Response": [("Existence", (0,)), ("Absence", (1,))],
+    "Chain Response": [("Existence", (0,)), ("Absence", (1,))],
+    "Precedence": [("Existence", (1,)), ("Absence", (0,))],
+    "Alternate Precedence": [("Existence", (1,)), ("Absence", (0,))],
+    "Succession": [("Existence", (0,)), ("Absence", (1,))],
+    "Alternate Succession": [("Existence", (0,)), ("Absence", (1,))],
+    "Chain Succession": [("Existence", (0,)), ("Absence", (1,))],
+    "Not Co-Existence": [("Existence", (0,)), ("Existence", (1,))],
+    "Not Responded Existence": [("Existence", (0,)), ("Existence", (1,))],
+    "Not Response": [("Init", (0,)), ("Existence", (1,))],
+    "Not Precedence": [("Init", (0,)), ("Existence", (1,))],
+    "Not Succession": [("Init", (0,)), ("Existence", (1,))],
+}
+
+# Phases of the --profile metrics (see ltlf_checker.Profiler) that decide satisfiability;
+# the rest of the "analysis" phase is the redundancy check
+SATISFIABILITY_PHASES = (
+    'analysis/edit', 'analysis/check/satisfiability', 'analysis/parse', 'analysis/satisfiability'
+)
+
+
+def activity_name(index: int) -> str:
+    """
+    Name of the index-th generated activity: acta, actb, ..., actz, actba, ...
+
+    Letters only, since Declare4Py rewrites the digits of activity names.
+    """
+    letters = chr(ord('a') + index % 26)
+    while index >= 26:
+        index = index // 26
+        letters = chr(ord('a') + index % 26) + letters
+    return f"act{letters}"
+
+
+def parse_template_mix(entries: list) -> dict:
+    """
+    Parse "Template" or "Template=weight" entries into a template mix
+    """
+    mix = {}
+    for entry in entries:
+        template_name, _, weight = entry.partition('=')
+        if template_name not in TEMPLATE_REGISTRY:
+            raise UnknownTemplateError(f"Unknown template: {template_name}")
+        mix[template_name] = float(weight) if weight else 1.0
+    return mix
+
+
+def format_constraint(template_name: str, activities: list) -> str:
+    """
+    Declare model line of a constraint, without conditions
+    """
+    return f"{template_name}[{', '.join(activities)}] |" + " |" * len(activities)
+
+
+def generate_model(activities: int, constraints: int, mix: dict = None, connectivity: float = 1.0,
+                   redundant: float = 0.0, contradictory: float = 0.0, seed: int = None) -> tuple:
+    """
+    Generate a random Declare model
+
+    Constraints draw their template from mix (template name to weight, every
+    template of TEMPLATE_REGISTRY by default). The activities are split into
+    groups and a constraint only relates activities of one group: connectivity 1
+    keeps a single group and connectivity 0 makes groups of two, so lower values
+    yield more independent components. A redundant and a contradictory fraction
+    of the constraints are planted: implied by another constraint through
+    IMPLIED_TEMPLATES, and contradicting one through TEMPLATE_CONTRADICTIONS
+    (a contradiction may take one constraint more than its share).
+
+    Returns the model text and the planted constraints, as lists of
+    {"template", "activities"} under "redundant" and "contradictory".
+    """
+    rng = random.Random(seed)
+    mix = mix or dict.fromkeys(TEMPLATE_REGISTRY, 1.0)
+    names = [activity_name(index) for index in range(activities)]
+    group_count = max(1, round((1 - connectivity) * activities / 2))
+    groups = [names[start::group_count] for start in range(group_count)]
+
+    templates = [template for template in mix if TEMPLATE_REGISTRY[template][0] <= activities]
+    if not templates:
+        raise ValueError('No template of the mix fits the number of activities')
+    weights = [mix[template] for template in templates]
+
+    planted_redundant = round(redundant * constraints)
+    planted_contradictory = round(contradictory * constraints)
+    model = []
+    for _ in range(max(constraints - planted_redundant - planted_contradictory, 1)):
+        template = rng.choices(templates, weights)[0]
+        arity = TEMPLATE_REGISTRY[template][0]
+        group = rng.choice([group for group in groups if len(group) >= arity])
+        model.append((template, rng.sample(group, arity)))
+
+    planted = {"redundant": [], "contradictory": []}
+    for _ in range(planted_redundant):
+        template, acts = rng.choice(model)
+        implied = sorted(
+            (implied_template, order) for implied_template, order in IMPLIED_TEMPLATES.get(template, ())
+            if (implied_template, order) != (template, tuple(range(len(acts))))
+        )
+        # A copy of a constraint is redundant through the original
+        implied_template, order = rng.choice(implied) if implied else (template, tuple(range(len(acts))))
+        planted["redundant"].append((implied_template, [acts[position] for position in order]))
+
+    while len(planted["contradictory"]) < planted_contradictory:
+        template, acts = rng.choice(model)
+        contradiction = TEMPLATE_CONTRADICTIONS.get(template)
+        if contradiction is None:
+            acts = [rng.choice(acts)]
+            contradiction = [("Existence", (0,)), ("Absence", (0,))]
+        planted["contradictory"].extend(
+            (contradicting, [acts[position] for position in positions]) for contradicting, positions in contradiction
+        )
+
+    model += planted["redundant"] + planted["contradictory"]
+    rng.shuffle(model)
+    lines = [f"activity {name}" for name in names] + [format_constraint(*constraint) for constraint in model]
+    return '\n'.join(lines) + '\n', {
+        role: [{"template": template, "activities": acts} for template, acts in constraints]
+        for role, constraints in planted.items()
+    }
+
+
+def run_engine(model_path: str, engine: str, repeat: int = 1, task_timeout: float = None,
+               model_text: str = None) -> tuple:
+    """
+    Analyze a model cold (no automata cache, empty template library) and keep the fastest run
+
+    Returns its seconds, its result and the --profile metrics of that run.
+    """
+    best, result, metrics = None, None, None
+    for _ in range(repeat):
+        TEMPLATE_LIBRARY.clear()
+        build_template_model.cache_clear()
+        profiler = Profiler()
+        start = time.perf_counter()
+        with profiling(profiler):
+            run_result = analyze_declare_model(
+                model_path, task_timeout=task_timeout, engine=engine, model_text=model_text
+            )
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best, result, metrics = elapsed, run_result, profiler.metrics()
+    return best, result, metrics
+
+
+def verdict(result: dict) -> tuple:
+    """
+    The parts of a result on which the engines must agree
+    """
+    return (
+        result.get('success'),
+        result.get('satisfiable'),
+        result.get('redundant'),
+        json.dumps(result.get('unchecked'))
+    )
+
+
+def split_analysis_seconds(metrics: dict) -> tuple:
+    """
+    Wall seconds spent deciding satisfiability and redundancy, from run_engine's metrics
+    """
+    phases = metrics['phases']
+    satisfiability = sum(phases[phase]['wall'] for phase in SATISFIABILITY_PHASES if phase in phases)
+    analysis = phases['analysis']['wall'] if 'analysis' in phases else 0.0
+    return satisfiability, max(analysis - satisfiability, 0.0)
+
+
+def planted_misses(result: dict, planted: dict) -> list:
+    """
+    Planted constraints whose expected verdict a complete result contradicts
+
+    Redundancy is not checked on unsatisfiable models, whose planted redundant
+    constraints are therefore not expected to be reported.
+    """
+    if not result.get('success') or not result.get('complete'):
+        return []
+    if planted['contradictory']:
+        return [] if result['satisfiable'] is False else planted['contradictory']
+    if result['satisfiable'] is False:
+        return []
+    redundant = {
+        json.dumps([decision['template'], decision['activities']])
+        for decision in result['decisions'] if decision['redundant']
+    }
+    return [item for item in planted['redundant'] if json.dumps([item['template'], item['activities']]) not in redundant]
+
+
+def run_sweep(sizes: list, engines: list, models_per_size: int = 1, mix: dict = None, connectivity: float = 1.0,
+              redundant: float = 0.0, contradictory: float = 0.0, seed: int = 0, repeat: int = 1,
+              task_timeout: float = None) -> dict:
+    """
+    Time every engine on generated models of every (activities, constraints) size
+
+    Returns the runs, one per model and engine, and a summary with the median
+    seconds of every size and engine.
+    """
+    runs = []
+    for activities, constraints in sizes:
+        for offset in range(models_per_size):
+            model_seed = seed + offset
+            model_text, planted = generate_model(
+                activities, constraints, mix, connectivity, redundant, contradictory, model_seed
+            )
+            for engine in engines:
+                seconds, result, metrics = run_engine(None, engine, repeat, task_timeout, model_text)
+                satisfiability_seconds, redundancy_seconds = split_analysis_seconds(metrics)
+                run = {
+                    "engine": engine,
+                    "activities": activities,
+                    "constraints": constraints,
+                    "seed": model_seed,
+                    "seconds": round(seconds, 6),
+                    "satisfiability_seconds": round(satisfiability_seconds, 6),
+                    "redundancy_seconds": round(redundancy_seconds, 6),
+                    "success": result.get('success'),
+                    "satisfiable": result.get('satisfiable'),
+                    "complete": result.get('complete'),
+                    "redundant": sum(decision['redundant'] for decision in result.get('decisions', [])),
+                    "planted_misses": planted_misses(result, planted),
+                    "peak_rss_mb": metrics['peak_rss_mb'],
+                }
+                runs.append(run)
+                print(json.dumps(run), flush=True)
+
+    summary = []
+    for activities, constraints in sizes:
+        for engine in engines:
+            size_runs = [run for run in runs if (run['engine'], run['activities'], run['constraints']) ==
+                         (engine, activities, constraints)]
+            summary.append({
+                "engine": engine,
+                "activities": activities,
+                "constraints": constraints,
+                "models": len(size_runs),
+                **{key: round(statistics.median(run[key] for run in size_runs), 6)
+                   for key in ("seconds", "satisfiability_seconds", "redundancy_seconds")}
+            })
+    return {"runs": runs, "summary": summary}
+
+
+def find_regressions(summary: list, baseline: list, tolerance: float = 0.25, slack: float = 0.05) -> list:
+    """
+    Sizes whose median seconds exceed the baseline's by more than tolerance (a fraction) plus slack seconds
+
+    Sizes missing from the baseline are not compared.
+    """
+    reference = {(entry['engine'], entry['activities'], entry['constraints']): entry for entry in baseline}
+    regressions = []
+    for entry in summary:
+        base = reference.get((entry['engine'], entry['activities'], entry['constraints']))
+        if base is not None and entry['seconds'] > base['seconds'] * (1 + tolerance) + slack:
+            regressions.append({**entry, "baseline_seconds": base['seconds']})
+    return regressions
+
+
+def evaluate(formula, trace: tuple, position: int = 0) -> bool:
+    """
+    Whether trace satisfies formula from position on, by the LTLf semantics
+
+    Deliberately naive and independent of both engines. A trace holds one symbol
+    per event: an atom of the model or OTHER_SYMBOL.
+    """
+    end = len(trace)
+    if isinstance(formula, LTLfTrue):
+        return True
+    if isinstance(formula, LTLfFalse):
+        return False
+    if isinstance(formula, LTLfAtomic):
+        return position < end and trace[position] == formula.s
+    if isinstance(formula, LTLfNot):
+        return not evaluate(formula.f, trace, position)
+    if isinstance(formula, LTLfAnd):
+        return all(evaluate(operand, trace, position) for operand in formula.formulas)
+    if isinstance(formula, LTLfOr):
+        return any(evaluate(operand, trace, position) for operand in formula.formulas)
+    if isinstance(formula, LTLfImplies):
+        # a -> b -> c reads (a -> b) -> c, as in ltlf2dfa
+        premise, *conclusions = formula.formulas
+        holds = evaluate(premise, trace, position)
+        for conclusion in conclusions:
+            holds = not holds or evaluate(conclusion, trace, position)
+        return holds
+    if isinstance(formula, LTLfEquivalence):
+        return len({evaluate(operand, trace, position) for operand in formula.formulas}) == 1
+    if isinstance(formula, LTLfNext):
+        return position + 1 < end and evaluate(formula.f, trace, position + 1)
+    if isinstance(formula, LTLfWeakNext):
+        return position + 1 >= end or evaluate(formula.f, trace, position + 1)
+    if isinstance(formula, LTLfEventually):
+        return any(evaluate(formula.f, trace, later) for later in range(position, end))
+    if isinstance(formula, LTLfAlways):
+        return all(evaluate(formula.f, trace, later) for later in range(position, end))
+    if isinstance(formula, (LTLfUntil, LTLfRelease)):
+        # a U b U c reads a U (b U c), as in ltlf2dfa
+        first, *rest = formula.formulas
+        second = rest[0] if len(rest) == 1 else type(formula)(rest)
+        if isinstance(formula, LTLfUntil):
+            return any(
+                evaluate(second, trace, later) and all(evaluate(first, trace, k) for k in range(position, later))
+                for later in range(position, end)
+            )
+        return all(
+            evaluate(second, trace, later) or any(evaluate(first, trace, k) for k in range(position, later))
+            for later in range(position, end)
+        )
+    if isinstance(formula, LTLfLast):
+        return position == end - 1
+    if isinstance(formula, LTLfEnd):
+        return position >= end
+    raise ValueError(f"Unsupported LTLf operator: {type(formula).__name__}")
+
+
+def brute_force(parsed_formulas: list, max_length: int) -> tuple:
+    """
+    Decide a model by evaluating its constraints on every trace of up to max_length events
+
+    Returns a shortest satisfying trace, or None, and for every constraint a
+    shortest counterexample to its redundancy (a trace satisfying every other
+    constraint but not this one), or None.
+    """
+    symbols = sorted(get_model_alphabet(parsed_formulas))
+    examples = {}
+    for length in range(1, max_length + 1):
+        for trace in product(symbols, repeat=length):
+            satisfied = sum(1 << index for index, formula in enumerate(parsed_formulas) if evaluate(formula, trace))
+            examples.setdefault(satisfied, trace)
+    every = (1 << len(parsed_formulas)) - 1
+    return examples.get(every), [examples.get(every & ~(1 << index)) for index in range(len(parsed_formulas))]
+
+
+def self_check_model(model_text: str, engines: list, max_length: int, repeat: int = 1,
+                     task_timeout: float = None) -> dict:
+    """
+    Check the verdicts of every engine on a model against brute_force
+
+    A verdict the bounded search refutes is unsound: an unsatisfiable model with
+    a satisfying trace, a redundant constraint with a counterexample, or a
+    progression witness that violates a constraint. A verdict it cannot confirm
+    within max_length events is only unconfirmed, since a longer trace may exist:
+    a satisfiable model without a satisfying trace, or a non-redundant constraint
+    without a counterexample. Constraints a result leaves unchecked are skipped.
+    """
+    ltlf_formulas, _, _ = build_ltlf_formulas(load_declare_model(model_text=model_text).get_decl_model_constraints())
+    parser = LTLfParser()
+    parsed_formulas = [parser(item['formula'].replace("[!]", "")) for item in ltlf_formulas]
+    witness, counterexamples = brute_force(parsed_formulas, max_length)
+    # Witnesses name activities, the formulas their atoms
+    atoms = {
+        act: f"con_{Utils.parse_activity(format_activity_name(act))}"
+        for item in ltlf_formulas for act in item['activities']
+    }
+    counterexample_of = {
+        (item['template'], tuple(item['activities'])): counterexample
+        for item, counterexample in zip(ltlf_formulas, counterexamples)
+    }
+
+    unsound, unconfirmed, errors = [], [], []
+    for engine in engines:
+        _, result, _ = run_engine(None, engine, repeat, task_timeout, model_text)
+        if not result.get('success'):
+            errors.append({"engine": engine, "error": result.get('error')})
+            continue
+
+        if result['satisfiable'] is False and witness is not None:
+            unsound.append({"engine": engine, "check": "satisfiable", "trace": witness})
+        if result['satisfiable'] and witness is None:
+            unconfirmed.append({"engine": engine, "check": "satisfiable"})
+        engine_witness = result.get('witness')
+        trace = tuple(atoms.get(symbol, symbol) for symbol in engine_witness or ())
+        if engine_witness and not all(evaluate(formula, trace) for formula in parsed_formulas):
+            unsound.append({"engine": engine, "check": "witness", "trace": engine_witness})
+
+        for decision in result['decisions']:
+            counterexample = counterexample_of[(decision['template'], tuple(decision['activities']))]
+            constraint = {"template": decision['template'], "activities": decision['activities']}
+            if decision['redundant'] and counterexample is not None:
+                unsound.append({"engine": engine, "check": "redundant", "constraint": constraint,
+                                "trace": counterexample})
+            if not decision['redundant'] and counterexample is None:
+                unconfirmed.append({"engine": engine, "check": "redundant", "constraint": constraint})
+
+    return {"unsound": unsound, "unconfirmed": unconfirmed, "errors": errors}
+
+
+def parse_size(size: str) -> tuple:
+    """
+    Parse an ACTIVITIESxCONSTRAINTS size
+    """
+    activities, _, constraints = size.partition('x')
+    return int(activities), int(constraints)
+
+
+def compare(args) -> int:
+    models = [
+        model for source in args.models
+        for model in ([source] if source.endswith('.decl') else list_batch_models(source))
+    ]
+    totals = {engine: 0.0 for engine in args.engines}
+    disagreements = 0
+
+    for model_path in models:
+        seconds, verdicts = {}, {}
+        for engine in args.engines:
+            seconds[engine], result, _ = run_engine(model_path, engine, args.repeat, args.task_timeout)
+            verdicts[engine] = verdict(result)
+            totals[engine] += seconds[engine]
+
+        agree = len(set(verdicts.values())) == 1
+        disagreements += not agree
+        print(json.dumps({
+            "model": model_path,
+            "seconds": seconds,
+            "satisfiable": {engine: verdicts[engine][1] for engine in args.engines},
+            "agree": agree
+        }), flush=True)
+
+    print(json.dumps({"models": len(models), "seconds": totals, "disagreements": disagreements}), file=sys.stderr)
+    return 0
+
+
+def generate(args) -> int:
+    os.makedirs(args.output, exist_ok=True)
+    mix = parse_template_mix(args.templates) if args.templates else None
+    for offset in range(args.count):
+        model_text, planted = generate_model(
+            args.activities, args.constraints, mix, args.connectivity, args.redundant, args.contradictory,
+            args.seed + offset
+        )
+        model_path = os.path.join(
+            args.output, f"model_a{args.activities}_c{args.constraints}_s{args.seed + offset}.decl"
+        )
+        with open(model_path, 'w') as model_file:
+            model_file.write(model_text)
+        print(json.dumps({"model": model_path, "planted": planted}), flush=True)
+    return 0
+
+
+def sweep(args) -> int:
+    mix = parse_template_mix(args.templates) if args.templates else None
+    results = run_sweep(
+        [parse_size(size) for size in args.sizes], args.engines, args.models_per_size, mix, args.connectivity,
+        args.redundant, args.contradictory, args.seed, args.repeat, args.task_timeout
+    )
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as output:
+            json.dump({"summary": results["summary"]}, output, indent=2)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = find_regressions(
+                results["summary"], json.load(baseline)["summary"], args.tolerance, args.slack
+            )
+    misses = sum(len(run["planted_misses"]) for run in results["runs"])
+    print(json.dumps({"summary": results["summary"], "regressions": regressions, "planted_misses": misses}),
+          file=sys.stderr)
+    return 1 if regressions or misses else 0
+
+
+def selfcheck(args) -> int:
+    mix = parse_template_mix(args.templates) if args.templates else None
+    totals = {"unsound": 0, "unconfirmed": 0, "errors": 0}
+    for offset in range(args.count):
+        model_text, _ = generate_model(
+            args.activities, args.constraints, mix, args.connectivity, args.redundant, args.contradictory,
+            args.seed + offset
+        )
+        report = self_check_model(model_text, args.engines, args.max_length, args.repeat, args.task_timeout)
+        for key in totals:
+            totals[key] += len(report[key])
+        print(json.dumps({"seed": args.seed + offset, **report}), flush=True)
+
+    print(json.dumps({"models": args.count, **totals}), file=sys.stderr)
+    return 1 if totals["unsound"] or totals["errors"] else 0
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--templates',
+        nargs='+',
+        help='Template mix as "Template" or "Template=weight" entries; every supported template by default'
+    )
+    parser.add_argument(
+        '--connectivity',
+        type=float,
+        default=1.0,
+        help='1 relates any two activities, 0 only activities of the same pair'
+    )
+    parser.add_argument(
+        '--redundant',
+        type=float,
+        default=0.0,
+        help='Fraction of planted constraints implied by another constraint'
+    )
+    parser.add_argument(
+        '--contradictory',
+        type=float,
+        default=0.0,
+        help='Fraction of planted constraints contradicting another constraint'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Seed of the first model; the next ones use the following seeds'
+    )
+
+
+def add_engine_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--engines',
+        nargs='+',
+        choices=ENGINES,
+        default=list(ENGINES),
+        help='Engines to run on every model'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='Runs per model and engine; the fastest one is reported'
+    )
+    parser.add_argument(
+        '--task-timeout',
+        type=float,
+        default=None,
+        help='Deadline in seconds for each compilation or search'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ltlf_checker engines on Declare models')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compare_parser = commands.add_parser('compare', help='Compare the engines on model files')
+    compare_parser.add_argument(
+        'models',
+        nargs='+',
+        help='Model files, directories, glob patterns or manifest files'
+    )
+    add_engine_arguments(compare_parser)
+
+    generate_parser = commands.add_parser('generate', help='Write synthetic Declare models')
+    generate_parser.add_argument(
+        'output',
+        help='Directory to write the models to'
+    )
+    generate_parser.add_argument(
+        '--activities',
+        type=int,
+        required=True,
+        help='Number of activities of every model'
+    )
+    generate_parser.add_argument(
+        '--constraints',
+        type=int,
+        required=True,
+        help='Number of constraints of every model'
+    )
+    generate_parser.add_argument(
+        '--count',
+        type=int,
+        default=1,
+        help='Number of models to write'
+    )
+    add_generator_arguments(generate_parser)
+
+    sweep_parser = commands.add_parser('sweep', help='Time the engines on synthetic models of growing size')
+    sweep_parser.add_argument(
+        '--sizes',
+        nargs='+',
+        default=['4x8', '8x16', '16x32'],
+        help='Model sizes as ACTIVITIESxCONSTRAINTS'
+    )
+    sweep_parser.add_argument(
+        '--models-per-size',
+        type=int,
+        default=3,
+        help='Number of models generated for every size'
+    )
+    sweep_parser.add_argument(
+        '--output',
+        type=str,
+        help='JSON file to write every run and the per-size summary to'
+    )
+    sweep_parser.add_argument(
+        '--baseline',
+        type=str,
+        help='JSON file of a previous sweep; a size slower than its baseline fails the run'
+    )
+    sweep_parser.add_argument(
+        '--save-baseline',
+        type=str,
+        help='JSON file to write this sweep\'s summary to, for later --baseline runs'
+    )
+    sweep_parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.25,
+        help='Allowed slowdown over the baseline, as a fraction of its median seconds'
+    )
+    sweep_parser.add_argument(
+        '--slack',
+        type=float,
+        default=0.05,
+        help='Allowed slowdown over the baseline in seconds, on top of --tolerance'
+    )
+    add_generator_arguments(sweep_parser)
+    add_engine_arguments(sweep_parser)
+
+    selfcheck_parser = commands.add_parser(
+        'selfcheck', help='Check the engines against a brute-force LTLf evaluator on small synthetic models'
+    )
+    selfcheck_parser.add_argument(
+        '--activities',
+        type=int,
+        default=3,
+        help='Number of activities of every model'
+    )
+    selfcheck_parser.add_argument(
+        '--constraints',
+        type=int,
+        default=4,
+        help='Number of constraints of every model'
+    )
+    selfcheck_parser.add_argument(
+        '--count',
+        type=int,
+        default=25,
+        help='Number of models to check'
+    )
+    selfcheck_parser.add_argument(
+        '--max-length',
+        type=int,
+        default=6,
+        help='Length of the longest trace the brute-force search evaluates'
+    )
+    add_generator_arguments(selfcheck_parser)
+    add_engine_arguments(selfcheck_parser)
+    selfcheck_parser.set_defaults(redundant=0.25, contradictory=0.1)
+
+    args = parser.parse_args()
+    sys.exit({'compare': compare, 'generate': generate, 'selfcheck': selfcheck, 'sweep': sweep}[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
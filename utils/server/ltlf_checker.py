@@ -5,23 +5,243 @@ import json
 import argparse
 from Declare4Py.ProcessModels.DeclareModel import DeclareModel
 from Declare4Py.ProcessModels.LTLModel import LTLModel, LTLTemplate
+from Declare4Py.Utils.utils import Utils
 from ltlf2dfa.parser.ltlf import LTLfParser
+from ltlf2dfa.ltlf import (
+    LTLfAlways, LTLfAnd, LTLfAtomic, LTLfEnd, LTLfEquivalence, LTLfEventually, LTLfFalse, LTLfImplies, LTLfLast,
+    LTLfNext, LTLfNot, LTLfOr, LTLfRelease, LTLfTrue, LTLfUntil, LTLfWeakNext,
+)
+from ltlf2dfa.base import MonaProgram
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlsplit, urlunsplit
+
 import os
-import re 
-from automata.fa.dfa import DFA
+import re
+import sqlite3
+import hashlib
+import time
+import zlib
+import csv
+import gzip
+import cProfile
+import resource
+import signal
+import subprocess
+import tempfile
+import glob
+import threading
+import multiprocessing
+import socketserver
+from collections import OrderedDict, deque
+from itertools import islice
+from xml.etree import ElementTree
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import numpy as np
+
+DEFAULT_MODEL_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'ltlf_checker', 'models.sqlite')
+DEFAULT_MODEL_CACHE_MB = 64
+
+# (connect, read) timeouts of model downloads, in seconds
+DOWNLOAD_TIMEOUT = (5, 30)
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+DOWNLOAD_RETRIES = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({'GET', 'HEAD'})
+)
+
+_http_session = {}
+
+
+def get_http_session() -> requests.Session:
+    """Return this process's pooled keep-alive session, with retries on transient failures.
+
+    Sessions are kept per process id, as pooled connections must not be shared
+    with forked batch workers.
+    """
+    session = _http_session.get(os.getpid())
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=DOWNLOAD_RETRIES)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _http_session.clear()
+        _http_session[os.getpid()] = session
+    return session
+
+
+def model_cache_key(url: str) -> str:
+    """Cache key of a model URL: presigned S3 URLs change their query string, not the object."""
+    parts = urlsplit(url)
+    if parts.hostname and parts.hostname.endswith('amazonaws.com'):
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+    return url
+
+
+class SQLiteLRUStore:
+    """Persistent, size-bounded LRU store kept in a SQLite table.
+
+    Subclasses name their table and list the statements creating it; the table
+    has key, size and last_used columns, and rows of dependent_tables sharing a
+    key are evicted along with it. The database runs in WAL mode, so it can be
+    shared by concurrent checker processes.
+    """
+
+    table = None
+    schema = ()
+    dependent_tables = ()
+
+    def __init__(self, path: str, max_bytes: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        for statement in self.schema:
+            self.connection.execute(statement)
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as just used."""
+        self.connection.execute(f'UPDATE {self.table} SET last_used = ? WHERE key = ?', (time.time(), key))
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the table fits in max_bytes."""
+        total = self.connection.execute(f'SELECT COALESCE(SUM(size), 0) FROM {self.table}').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        stale_keys = []
+        for key, size in self.connection.execute(f'SELECT key, size FROM {self.table} ORDER BY last_used'):
+            if total <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+        for table in (self.table, *self.dependent_tables):
+            self.connection.executemany(f'DELETE FROM {table} WHERE key = ?', stale_keys)
+
+    def reopen(self) -> None:
+        """Give a forked process its own connection to the database.
+
+        A SQLite connection must not be used or closed across fork, so the
+        inherited one is set aside untouched.
+        """
+        self.inherited_connection = self.connection
+        self.connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class ModelCache(SQLiteLRUStore):
+    """Persistent, size-bounded LRU store of downloaded model bodies.
+
+    Entries keep the ETag and Last-Modified validators of their response, so
+    download_model revalidates a cached body with a conditional request and only
+    transfers it again when it changed.
+    """
+
+    table = 'model_bodies'
+    schema = (
+        'CREATE TABLE IF NOT EXISTS model_bodies ('
+        'key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB NOT NULL, '
+        'size INTEGER NOT NULL, last_used REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS model_bodies_last_used ON model_bodies (last_used)',
+    )
+
+    def __init__(self, path: str = DEFAULT_MODEL_CACHE_PATH, max_bytes: int = DEFAULT_MODEL_CACHE_MB * 1024 * 1024):
+        super().__init__(path, max_bytes)
 
-def download_model(url: str) -> str:
+    def validators(self, url: str) -> dict:
+        """Conditional request headers for the cached body of url, empty when there is none."""
+        row = self.connection.execute(
+            'SELECT etag, last_modified FROM model_bodies WHERE key = ?', (model_cache_key(url),)
+        ).fetchone()
+        if row is None:
+            return {}
+        headers = {'If-None-Match': row[0], 'If-Modified-Since': row[1]}
+        return {name: value for name, value in headers.items() if value}
+
+    def get(self, url: str):
+        """Return the cached body of url, or None."""
+        key = model_cache_key(url)
+        row = self.connection.execute('SELECT body FROM model_bodies WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self.hits += 1
+        self.touch(key)
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def put(self, url: str, body: str, etag: str = None, last_modified: str = None) -> None:
+        """Store a body with its validators and evict least recently used entries over the size bound."""
+        self.misses += 1
+        if not (etag or last_modified):
+            # Without validators the body could never be reused safely
+            return
+        blob = zlib.compress(body.encode('utf-8'))
+        self.connection.execute(
+            'INSERT OR REPLACE INTO model_bodies (key, etag, last_modified, body, size, last_used) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (model_cache_key(url), etag, last_modified, blob, len(blob), time.time())
+        )
+        self.evict()
+
+
+def read_model_response(url: str, response: requests.Response, model_cache: ModelCache = None) -> str:
+    """Read a streamed model body and store it in model_cache."""
+    response.raise_for_status()
+    content = b''.join(response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES))
+    body = content.decode(response.encoding or 'utf-8')
+    if model_cache is not None:
+        model_cache.put(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return body
+
+
+def download_model(url: str, model_cache: ModelCache = None) -> str:
     """
     Download the model file from the given URL
+
+    The body is streamed over the process's pooled session (see get_http_session).
+    With a model_cache, a cached body is revalidated and reused on 304 Not Modified.
     """
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.text
-    except Exception as e:
-        raise
+    session = get_http_session()
+    headers = model_cache.validators(url) if model_cache is not None else {}
+    with session.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        if response.status_code != 304:
+            return read_model_response(url, response, model_cache)
+
+    body = model_cache.get(url) if headers else None
+    if body is not None:
+        return body
+
+    # The cached body was evicted since its validators were read
+    with session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        return read_model_response(url, response, model_cache)
+
+
+def load_declare_model(model_path: str = None, model_text: str = None, model_cache: ModelCache = None) -> DeclareModel:
+    """Parse a Declare model from model_text, a URL or a file, without temporary files."""
+    declare_model = DeclareModel()
+    if model_text is None and model_path.startswith('http'):
+        model_text = download_model(model_path, model_cache)
+    if model_text is not None:
+        return declare_model.parse_from_string(model_text)
+    return declare_model.parse_from_file(model_path)
+
 
 def parse_declare_constraint(constraint_str: str) -> tuple:
     """
@@ -45,217 +265,106 @@ def parse_declare_constraint(constraint_str: str) -> tuple:
     except Exception as e:
         return None, None, None
 
+class UnknownTemplateError(ValueError):
+    """Raised for a constraint template without a rule in TEMPLATE_REGISTRY."""
+
+
+# Names Declare4Py's parser gives to the templates it renames
+TEMPLATE_ALIASES = {"Existence1": "Existence", "Absence1": "Absence"}
+
+# Formula construction rules, by template: its number of activities and one of
+#   ("pattern", formula)  a formula over the formatted activities {0}, {1},
+#   ("declare", name)     a Declare4Py LTLTemplate filled with the activities,
+#   ("and", parts)        the conjunction of (template, positions) parts, over the
+#                         activities taken in the given order,
+#   ("not", template)     the negation of a template over the same activities.
+# Atoms are "con_" and the activity, as in Declare4Py's templates, so that unary
+# and binary constraints on an activity refer to the same proposition.
+TEMPLATE_REGISTRY = {
+    "Init": (1, ("pattern", "con_{0}")),
+    "Existence": (1, ("pattern", "F(con_{0})")),
+    "Existence2": (1, ("pattern", "F(con_{0} && X[!](F(con_{0})))")),
+    "Existence3": (1, ("pattern", "F(con_{0} && X[!](F(con_{0} && X[!](F(con_{0})))))")),
+    "Absence": (1, ("not", "Existence")),
+    "Absence2": (1, ("not", "Existence2")),
+    "Absence3": (1, ("not", "Existence3")),
+    "Exactly1": (1, ("and", [("Existence", (0,)), ("Absence2", (0,))])),
+    "Exactly2": (1, ("and", [("Existence2", (0,)), ("Absence3", (0,))])),
+    "Choice": (2, ("declare", "eventually_a_or_b")),
+    "Exclusive Choice": (2, ("and", [("Choice", (0, 1)), ("Not Co-Existence", (0, 1))])),
+    "Responded Existence": (2, ("declare", "responded_existence")),
+    "Co-Existence": (2, ("and", [("Responded Existence", (0, 1)), ("Responded Existence", (1, 0))])),
+    "Response": (2, ("declare", "response")),
+    "Alternate Response": (2, ("declare", "alternate_response")),
+    "Chain Response": (2, ("declare", "chain_response")),
+    "Precedence": (2, ("declare", "precedence")),
+    "Alternate Precedence": (2, ("declare", "alternate_precedence")),
+    "Chain Precedence": (2, ("declare", "chain_precedence")),
+    "Succession": (2, ("and", [("Response", (0, 1)), ("Precedence", (0, 1))])),
+    "Alternate Succession": (2, ("and", [("Alternate Response", (0, 1)), ("Alternate Precedence", (0, 1))])),
+    "Chain Succession": (2, ("and", [("Chain Response", (0, 1)), ("Chain Precedence", (0, 1))])),
+    "Not Co-Existence": (2, ("pattern", "!(F(con_{0}) && F(con_{1}))")),
+    "Not Responded Existence": (2, ("declare", "not_responded_existence")),
+    "Not Response": (2, ("declare", "not_response")),
+    "Not Chain Response": (2, ("declare", "not_chain_response")),
+    "Not Precedence": (2, ("declare", "not_precedence")),
+    "Not Chain Precedence": (2, ("declare", "not_chain_precedence")),
+    # Declare's Not Succession is G(a -> !F(b)) and Not Chain Succession G(a -> !X(b)),
+    # which Declare4Py builds as not_response and not_chain_precedence
+    "Not Succession": (2, ("declare", "not_response")),
+    "Not Chain Succession": (2, ("declare", "not_chain_precedence")),
+}
+
+DECLARE_TEMPLATES = {
+    rule: LTLTemplate(rule) for _, (kind, rule) in TEMPLATE_REGISTRY.values() if kind == "declare"
+}
+
+
+@lru_cache(maxsize=4096)
+def build_template_model(template_name: str, activities: tuple) -> LTLModel:
+    """Build a template over formatted activities from its TEMPLATE_REGISTRY rule."""
+    _, (kind, rule) = TEMPLATE_REGISTRY[template_name]
+
+    if kind == "declare":
+        template = DECLARE_TEMPLATES[rule]
+        # fill_template accumulates the parameters of every call on the template
+        template.parameters = []
+        if rule in template.tb_declare_templates:
+            return template.fill_template([activities[0]], [activities[1]])
+        return template.fill_template(list(activities))
+
+    model = LTLModel()
+    if kind == "pattern":
+        model.parse_from_string(rule.format(*activities))
+    elif kind == "and":
+        parts = [build_template_model(part, tuple(activities[i] for i in positions)) for part, positions in rule]
+        model.parse_from_string(parts[0].formula)
+        for part in parts[1:]:
+            model.add_conjunction(part.formula)
+    else:
+        model.parse_from_string(build_template_model(rule, activities).formula)
+        model.add_negation()
+    return model
+
+
 def create_ltl_formula(template_name: str, activities: list) -> LTLModel:
     """
-    Creates LTL formula using both LTLModel methods and LTLTemplate when needed
+    Creates the LTL formula of a constraint from its TEMPLATE_REGISTRY rule
+
+    Models are memoized on (template, formatted activities) and shared between
+    calls, so they must not be modified. Raises UnknownTemplateError for a
+    template without a rule and ValueError for a wrong number of activities.
     """
-    model = LTLModel()
-    activities = [format_activity_name(act) for act in activities]
-    
-    try:
-        if template_name == "Init":
-            model.parse_from_string(activities[0])
-            
-        elif template_name == "Existence":
-            model.parse_from_string(activities[0])
-            model.add_eventually()
-            
-        elif template_name == "Absence":
-            model.parse_from_string(activities[0])
-            model.add_eventually()
-            model.add_negation()
-
-        elif template_name == "Absence2":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('absence_twice')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-
-        elif template_name == "Absence3":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('absence_triple')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-            
-        elif template_name == "Exactly1":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('exactly_once')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-
-        elif template_name == "Exactly2":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('exactly_twice')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-
-        elif template_name == "Existence2":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('existence_twice')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-
-        elif template_name == "Existence3":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('existence_triple')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-            
-        # Binary templates using LTLModel methods
-        elif template_name == "Response":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('response')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-            
-        elif template_name == "Chain Response":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('chain_response')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-            
-        elif template_name == "Alternate Response":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('alternate_response')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-
-        elif template_name == "Responded Existence":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('responded_existence')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-
-        elif template_name == "Precedence":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('precedence')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-            
-        elif template_name == "Alternate Precedence":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('alternate_precedence')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-            
-        elif template_name == "Chain Precedence":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('chain_precedence')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-            
-        elif template_name == "Succession":
-            response_model = create_ltl_formula("Response", activities)
-            precedence_model = create_ltl_formula("Precedence", activities)
-            model.parse_from_string(response_model.formula)
-            model.add_conjunction(precedence_model.formula)
-            
-        elif template_name == "Alternate Succession":
-            alt_response_model = create_ltl_formula("Alternate Response", activities)
-            alt_precedence_model = create_ltl_formula("Alternate Precedence", activities)
-            model.parse_from_string(alt_response_model.formula)
-            model.add_conjunction(alt_precedence_model.formula)
-            
-        elif template_name == "Choice":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('eventually_a_or_b')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-            
-        elif template_name == "Exclusive Choice":
-            choice_template = LTLTemplate('eventually_a_or_b')
-            not_coexist_template = LTLTemplate('not_coexistence')
-            model.parse_from_string(choice_template.fill_template(activities).formula)
-            model.add_conjunction(not_coexist_template.fill_template(activities).formula)
-        
-        elif template_name == "Not Chain Precedence":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('not_chain_precedence')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-        
-        elif template_name == "Not Chain Response":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('not_chain_response')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-        
-        elif template_name == "Not Precedence":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('not_precedence')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-        
-        elif template_name == "Not Responded Existence":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('not_responded_existence')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-
-        elif template_name == "Not Response":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('not_response')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-
-        elif template_name == "Not Co-Existence":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('not_coexistence')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-                
-        elif template_name == "Not Succession":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('not_succession')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)
-        
-        elif template_name == "Co-Existence":
-            implies_b_template = LTLTemplate('eventually_a_implies_eventually_b')
-            implies_a_template = LTLTemplate('eventually_b_implies_eventually_a')
-            model.parse_from_string(implies_b_template.fill_template(activities).formula)
-            model.add_conjunction(implies_a_template.fill_template(activities).formula)
-        
-        elif template_name == "Not Chain Succession":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('not_chain_succession')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)  
-
-        elif template_name == "Chain Succession":
-            activation = [activities[0]]
-            target = [activities[1]]
-            template = LTLTemplate('chain_succession')
-            temp_model = template.fill_template(activation, target)
-            model.parse_from_string(temp_model.formula)     
-            
-        return model
-        
-    except Exception as e:
-        return None
-    
+    template_name = TEMPLATE_ALIASES.get(template_name, template_name)
+    if template_name not in TEMPLATE_REGISTRY:
+        raise UnknownTemplateError(f"Unknown template: {template_name}")
+
+    arity = TEMPLATE_REGISTRY[template_name][0]
+    if len(activities) != arity:
+        raise ValueError(f"{template_name} takes {arity} activities, got {len(activities)}")
+    return build_template_model(template_name, tuple(format_activity_name(act) for act in activities))
+
+
 def format_activity_name(activity: str) -> str:
     """Format activity name for LTL formula.
 
@@ -280,228 +389,2842 @@ def format_activity_name(activity: str) -> str:
 
 
 
-def check_semantical_redundacy(ltlf_formulas: list, original_model: LTLModel) -> any:
-    parser = LTLfParser()
-    original_model_formula = original_model.formula.replace("[!]", "")
-    parsed_original_model_formula = parser(original_model_formula)
-    original_dfa = parsed_original_model_formula.to_dfa()
+OTHER_SYMBOL = '*'
 
-    base_filename = 'original_dfa'
-    filename = base_filename + '.txt'
-    count = 1
 
-    redundant_cons = []
+def get_model_alphabet(parsed_formulas: list) -> frozenset:
+    """Return the input alphabet shared by all constraint automata of a model.
 
-    while os.path.exists(os.path.join('dfas', filename)):
-        filename = f'{base_filename}_{count}.txt'
-        count += 1
-    filepath = os.path.join('dfas', filename)
-    with open(filepath, 'w') as f:
-        f.write(original_dfa)
+    Traces are read under the Declare assumption that every event carries exactly
+    one activity, so a symbol is either an atom of the model or OTHER_SYMBOL, which
+    stands for any activity the model does not mention.
+    """
+    atoms = set()
+    for parsed_formula in parsed_formulas:
+        atoms.update(str(label) for label in parsed_formula.find_labels())
+    return frozenset(atoms | {OTHER_SYMBOL})
 
-    og_states, og_input_symbols, og_transitions, og_initial_state, og_final_states = convert_dfa_file(filename)
 
-    og_dfa = DFA(
-        states=og_states,
-        input_symbols=og_input_symbols,
-        transitions=og_transitions,
-        initial_state=og_initial_state,
-        final_states=og_final_states,
-        allow_partial=True
-    )
+class ArrayDFA:
+    """Complete DFA over an interned alphabet, stored in dense NumPy arrays.
 
-    os.remove(filepath)
+    symbols is the sorted alphabet, table[state, i] the successor of state on
+    symbols[i] and accepting[state] whether state is final; state 0 is initial.
+    Automata returned by minify are reachable, minimal and numbered in BFS order.
+    """
 
-    for i, current_formula in enumerate(ltlf_formulas):
-        combined_model = LTLModel()
-        first = True
-        
-        for j, other_formula in enumerate(ltlf_formulas):
-            if i != j: 
-                if first:
-                    combined_model.parse_from_string(other_formula['formula'])
-                    first = False
-                else:
-                    combined_model.add_conjunction(other_formula['formula'])
-        
-        combined_model_formula = combined_model.formula.replace("[!]", "")
-        parsed_combined_model_formula = parser(combined_model_formula)
+    def __init__(self, symbols: tuple, table: np.ndarray, accepting: np.ndarray):
+        self.symbols = tuple(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.table = table
+        self.accepting = accepting
 
-        combined_dfa = parsed_combined_model_formula.to_dfa()
+    @classmethod
+    def from_transitions(cls, alphabet, transitions: dict, initial_state, final_states) -> 'ArrayDFA':
+        """Build an automaton from {state: {symbol: state}}; missing moves go to a rejecting sink."""
+        symbols = tuple(sorted(alphabet))
+        states = [initial_state] + [state for state in transitions if state != initial_state]
+        numbers = {state: number for number, state in enumerate(states)}
+        sink = len(states)
+        table = np.full((sink + 1, len(symbols)), sink, dtype=np.int32)
+        for state, moves in transitions.items():
+            for symbol, target in moves.items():
+                table[numbers[state], symbols.index(symbol)] = numbers.get(target, sink)
+        accepting = np.zeros(sink + 1, dtype=bool)
+        accepting[[numbers[state] for state in final_states if state in numbers]] = True
+        return cls(symbols, table, accepting)
 
-        base_filename = 'combined_dfa'
-        filename = base_filename + '.txt'
-        count = 1
+    @classmethod
+    def universal(cls, alphabet) -> 'ArrayDFA':
+        return cls(sorted(alphabet), np.zeros((1, len(alphabet)), dtype=np.int32), np.ones(1, dtype=bool))
 
-        while os.path.exists(os.path.join('dfas', filename)):
-            filename = f'{base_filename}_{count}.txt'
-            count += 1
-        filepath = os.path.join('dfas', filename)
-        with open(filepath, 'w') as f:
-            f.write(combined_dfa)
-
-        com_states, com_input_symbols, com_transitions, com_initial_state, com_final_states = convert_dfa_file(filename)
-
-        com_dfa = DFA(
-            states=com_states,
-            input_symbols=com_input_symbols,
-            transitions=com_transitions,
-            initial_state=com_initial_state,
-            final_states=com_final_states,
-            allow_partial=True
-        )
+    @classmethod
+    def empty(cls, alphabet) -> 'ArrayDFA':
+        return cls(sorted(alphabet), np.zeros((1, len(alphabet)), dtype=np.int32), np.zeros(1, dtype=bool))
 
-        os.remove(filepath)
+    @property
+    def input_symbols(self) -> frozenset:
+        return frozenset(self.symbols)
 
-        if(og_dfa == com_dfa):
-            redundant_cons.append(current_formula)
-        
-    redundant_cons = list({json.dumps(d, sort_keys=True): d for d in redundant_cons}.values())
-    redundant_cons = [{'template': item['template'], 'activities': item['activities']} for item in redundant_cons]
-    return redundant_cons
-        
-def convert_dfa_file(filename):
-    with open(os.path.join('dfas', filename), 'r') as file:
-        content = file.read()
-    
-    states = set()
-    input_symbols = set()
-    transitions = {}
-    initial_state = ''
-    final_states = set()
-    
-    # Get initial state
-    init_match = re.search(r'init -> (\d+);', content)
-    if init_match:
-        initial_state = init_match.group(1)
-    
-    # Get final states
-    final_states_match = re.findall(r'node \[shape = doublecircle\]; (\d+);', content)
-    final_states.update(final_states_match)
-    
-    # Get all transitions and build states and input_symbols sets
-    transition_pattern = r'(\d+) -> (\d+) \[label="([^"]+)"\];'
-    transitions_matches = re.findall(transition_pattern, content)
-    
-    # Process transitions
-    for from_state, to_state, label in transitions_matches:
-        states.add(from_state)
-        states.add(to_state)
-        
-        # Initialize transitions dictionary for the from_state if not exists
-        if from_state not in transitions:
-            transitions[from_state] = {}
-            
-        # Add the transition
-        transitions[from_state][label] = to_state
-        input_symbols.add(label)
-    
-    return states, input_symbols, transitions, initial_state, final_states       
+    def __len__(self) -> int:
+        return len(self.accepting)
+
+    def renumber(self) -> 'ArrayDFA':
+        """Drop unreachable states and number the others in BFS order."""
+        table = self.table.tolist()
+        numbers = {0: 0}
+        order = [0]
+        for state in order:
+            for target in table[state]:
+                if target not in numbers:
+                    numbers[target] = len(order)
+                    order.append(target)
+        remap = np.zeros(len(self), dtype=np.int32)
+        remap[order] = np.arange(len(order), dtype=np.int32)
+        return ArrayDFA(self.symbols, remap[self.table[order]], self.accepting[order])
+
+    def minify(self) -> 'ArrayDFA':
+        """Minimize with Hopcroft's partition refinement."""
+        dfa = self.renumber()
+        size, width = dfa.table.shape
+
+        # Predecessors by symbol, as CSR: sources[i][starts[i][t]:starts[i][t + 1]] move to t
+        sources = np.argsort(dfa.table, axis=0, kind='stable').T
+        starts = [np.searchsorted(dfa.table[column, i], np.arange(size + 1)) for i, column in enumerate(sources)]
+
+        blocks = [block for block in (np.flatnonzero(dfa.accepting), np.flatnonzero(~dfa.accepting)) if block.size]
+        block_of = np.zeros(size, dtype=np.int32)
+        for number, block in enumerate(blocks):
+            block_of[block] = number
+        pending = {(min(range(len(blocks)), key=lambda number: blocks[number].size), i) for i in range(width)}
+        marked = np.zeros(size, dtype=bool)
+
+        while pending:
+            splitter, i = pending.pop()
+            column, offsets = sources[i], starts[i]
+            preimage = np.concatenate([column[offsets[t]:offsets[t + 1]] for t in blocks[splitter].tolist()])
+            if not preimage.size:
+                continue
+            hits = np.bincount(block_of[preimage], minlength=len(blocks))
+            marked[preimage] = True
+            for number in np.flatnonzero(hits).tolist():
+                if hits[number] == blocks[number].size:
+                    continue
+                members = blocks[number]
+                inside, outside = members[marked[members]], members[~marked[members]]
+                blocks[number] = inside
+                blocks.append(outside)
+                block_of[outside] = len(blocks) - 1
+                smaller = number if inside.size <= outside.size else len(blocks) - 1
+                for j in range(width):
+                    pending.add((len(blocks) - 1, j) if (number, j) in pending else (smaller, j))
+            marked[preimage] = False
+
+        representatives = np.array([block[0] for block in blocks])
+        quotient = ArrayDFA(dfa.symbols, block_of[dfa.table[representatives]], dfa.accepting[representatives])
+        if block_of[0] != 0:
+            swap = np.arange(len(blocks), dtype=np.int32)
+            swap[[0, block_of[0]]] = swap[[block_of[0], 0]]
+            quotient = ArrayDFA(dfa.symbols, swap[quotient.table[swap]], quotient.accepting[swap])
+        return quotient.renumber()
+
+    def intersection(self, other: 'ArrayDFA') -> 'ArrayDFA':
+        """Minimal automaton of the product, built breadth-first over reachable pairs only."""
+        if self.symbols != other.symbols:
+            raise ValueError('Automata must share their alphabet')
+
+        width = len(other)
+        numbers = {0: 0}
+        frontier = np.zeros(1, dtype=np.int64)
+        pairs, rows = [frontier], []
+        while frontier.size:
+            codes = self.table[frontier // width].astype(np.int64) * width + other.table[frontier % width]
+            unique = np.unique(codes)
+            fresh = []
+            for code in unique.tolist():
+                if code not in numbers:
+                    numbers[code] = len(numbers)
+                    fresh.append(code)
+            lookup = np.array([numbers[code] for code in unique.tolist()], dtype=np.int32)
+            rows.append(lookup[np.searchsorted(unique, codes)])
+            frontier = np.array(fresh, dtype=np.int64)
+            pairs.append(frontier)
+
+        pairs = np.concatenate(pairs)
+        accepting = self.accepting[pairs // width] & other.accepting[pairs % width]
+        return ArrayDFA(self.symbols, np.concatenate(rows), accepting).minify()
+
+    def isempty(self) -> bool:
+        return not self.renumber().accepting.any()
+
+    def equivalent(self, other: 'ArrayDFA') -> bool:
+        """Hopcroft-Karp: merge states reached by the same words, stop at the first conflict."""
+        if self.symbols != other.symbols:
+            raise ValueError('Automata must share their alphabet')
+
+        offset = len(self)
+        table = self.table.tolist() + (other.table + offset).tolist()
+        accepting = self.accepting.tolist() + other.accepting.tolist()
+        parent = list(range(len(table)))
+
+        def find(state):
+            while parent[state] != state:
+                parent[state] = parent[parent[state]]
+                state = parent[state]
+            return state
+
+        if accepting[0] != accepting[offset]:
+            return False
+        parent[0] = offset
+        pending = [(0, offset)]
+        while pending:
+            left, right = pending.pop()
+            for left_target, right_target in zip(table[left], table[right]):
+                left_root, right_root = find(left_target), find(right_target)
+                if left_root != right_root:
+                    if accepting[left_target] != accepting[right_target]:
+                        return False
+                    parent[left_root] = right_root
+                    pending.append((left_target, right_target))
+        return True
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ArrayDFA) and self.equivalent(other)
+
+    __hash__ = None
+
+    def lift(self, alphabet: frozenset) -> 'ArrayDFA':
+        """Extend to a larger alphabet; new symbols move like OTHER_SYMBOL.
+
+        Atoms the automaton does not mention are false on its guards, so the new
+        symbols move exactly like OTHER_SYMBOL. An automaton already over alphabet
+        is returned as is.
+        """
+        if self.input_symbols == alphabet:
+            return self
+        symbols = tuple(sorted(alphabet))
+        columns = [self.index.get(symbol, self.index[OTHER_SYMBOL]) for symbol in symbols]
+        return ArrayDFA(symbols, self.table[:, columns], self.accepting)
+
+    def relabel(self, labels: dict) -> 'ArrayDFA':
+        """Rename symbols; symbols missing from labels are kept."""
+        renamed = [labels.get(symbol, symbol) for symbol in self.symbols]
+        order = sorted(range(len(renamed)), key=renamed.__getitem__)
+        return ArrayDFA([renamed[i] for i in order], self.table[:, order], self.accepting)
 
-def analyze_declare_model(model_path: str) -> dict:
+
+MONA_TRANSITION = re.compile(r'State (\d+): ([01X]*) -> state (\d+)')
+
+
+def guard_symbols(guard: str, positions: dict) -> list:
+    """Return the symbols whose event satisfies a MONA ternary guard.
+
+    positions maps every symbol to the index of its free variable, or None for
+    symbols the automaton does not mention. An event sets exactly one atom to 1,
+    so OTHER_SYMBOL (and any unmentioned symbol) only matches guards without a 1.
     """
-    Analyze a Declare model and check its satisfiability
+    ones = guard.count('1')
+    matched = []
+
+    for symbol, index in positions.items():
+        if index is None:
+            if ones == 0:
+                matched.append(symbol)
+        elif guard[index] != '0' and ones == (guard[index] == '1'):
+            matched.append(symbol)
+
+    return matched
+
+
+def parse_mona_dfa(mona_output: str, alphabet: frozenset) -> ArrayDFA:
+    """Build a complete, minimal DFA over alphabet from MONA output, in one pass.
+
+    As in ltlf2dfa, state 0 is MONA's pre-initial state and is skipped, so the
+    automaton starts in state 1.
     """
-    try:       
-        # Download model if it's a URL
-        if model_path.startswith('http'):
-            model_content = download_model(model_path)
-    
-            # Define paths
-            existing_temp_path = '/tmp/temp_model.decl'
-    
-            if os.path.exists(existing_temp_path):
-                # Create new file with timestamp
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                temp_path = f'/tmp/temp_model_{timestamp}.decl'
-                with open(temp_path, 'w') as f:
-                    f.write(model_content)
-            else:
-                # Save to original temp path
-                temp_path = existing_temp_path
-                with open(temp_path, 'w') as f:
-                    f.write(model_content)
-    
-            model_path = temp_path
+    if not mona_output:
+        raise RuntimeError('MONA did not return an automaton')
+    if 'Formula is unsatisfiable' in mona_output:
+        return ArrayDFA.empty(alphabet)
 
-        # Parse Declare model
-        declare_model = DeclareModel()
-        declare_model.parse_from_file(model_path)
-        
-        # Get activities and constraints
-        model_activities = declare_model.get_model_activities()
-        model_constraints = declare_model.get_decl_model_constraints()
-        
-        # Create main LTL model for final result
-        ltl_model = LTLModel()
-        ltl_formulas = []
- 
-        # Process each constraint
-        for constraint in model_constraints:
-            template_name, activities, *_ = parse_declare_constraint(constraint)
-            
-            if not template_name:
+    positions = dict.fromkeys(alphabet)
+    final_states = set()
+    transitions = {}
+
+    for line in mona_output.splitlines():
+        if line.startswith('State '):
+            from_state, guard, to_state = MONA_TRANSITION.match(line).groups()
+            if from_state == '0':
                 continue
-            
-            # Create LTL formula using template
-            constraint_model = create_ltl_formula(template_name, activities)
+            moves = transitions.setdefault(int(from_state), {})
+            for symbol in guard_symbols(guard, positions):
+                moves.setdefault(symbol, int(to_state))
 
-            if constraint_model and constraint_model.formula:
-                ltl_formulas.append({
-                    'template': template_name,
-                    'activities': activities,
-                    'formula': constraint_model.formula
-                })
-        
-        for idx, formula_dict in enumerate(ltl_formulas):
-            if idx == 0:
-                ltl_model.parse_from_string(formula_dict['formula'])
-            else:
-                ltl_model.add_conjunction(formula_dict['formula'])
-        
-        # Check satisfiability
-        ltl_model.parse_from_string(ltl_model.formula)
-        is_satisfiable = ltl_model.check_satisfiability(minimize_automaton=False)
+        elif line.startswith('DFA for formula with free variables:'):
+            for index, variable in enumerate(line.split(':', 1)[1].split()):
+                if variable.lower() in positions:
+                    positions[variable.lower()] = index
 
-        redundant_cons = check_semantical_redundacy(ltl_formulas, ltl_model)
-        
-        result = {
-            "success": True,
-            "redundant": str(redundant_cons),
-            "satisfiable": is_satisfiable,
-            "timestamp": datetime.now().isoformat()
+        elif line.startswith('Accepting states:'):
+            final_states = {int(state) for state in line.split(':', 1)[1].split()}
+
+    return ArrayDFA.from_transitions(alphabet, transitions, 1, final_states).minify()
+
+
+class TaskTimeout(Exception):
+    """Raised when a single analysis task runs past its deadline."""
+
+
+@contextmanager
+def task_deadline(seconds: float = None):
+    """Raise TaskTimeout in the enclosed block once seconds have elapsed.
+
+    Relies on SIGALRM, so the deadline is only armed on the main thread of a
+    process; elsewhere the block runs unbounded.
+    """
+    if not seconds or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise TaskTimeout(f'Task exceeded its {seconds}s deadline')
+
+    previous_handler = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def deadline_passed(expires_at: float = None) -> bool:
+    """Whether the time.monotonic() instant expires_at, if any, has been reached."""
+    return expires_at is not None and time.monotonic() >= expires_at
+
+
+def time_left(expires_at: float = None, task_timeout: float = None) -> float:
+    """Timeout of a task that must end within task_timeout and by expires_at.
+
+    Returns None when neither bound is set. An expired budget yields a minimal
+    positive timeout rather than 0, which task_deadline reads as no deadline.
+    """
+    if expires_at is None:
+        return task_timeout
+    left = max(expires_at - time.monotonic(), 0.001)
+    return left if task_timeout is None else min(task_timeout, left)
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process and of its reaped children, such as MONA runs."""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+class Profiler:
+    """Wall and CPU time per phase, event counts and automaton sizes of an analysis.
+
+    Phases nest: a phase entered inside another is recorded under the path of
+    both, e.g. "analysis/edit/compile/mona", and its time is also part of its
+    parents'. Pool workers profile their own tasks (see run_profiled), and their
+    records are merged under the phase that waited for them, so the time of a
+    phase run in workers is summed over processes and can exceed its parent's.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counts = {}
+        self.automata = {}
+        self.constraint_automata = []
+        self.stack = []
+        self.worker_rss_kb = 0
+        self.wall = None
+        self.cpu = None
+
+    @contextmanager
+    def phase(self, name: str):
+        self.stack.append(name)
+        path = '/'.join(self.stack)
+        wall, cpu = time.perf_counter(), cpu_seconds()
+        try:
+            yield
+        finally:
+            self.add_phase(path, 1, time.perf_counter() - wall, cpu_seconds() - cpu)
+            self.stack.pop()
+
+    def add_phase(self, path: str, calls: int, wall: float, cpu: float) -> None:
+        phase = self.phases.setdefault(path, {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+        phase['calls'] += calls
+        phase['wall'] += wall
+        phase['cpu'] += cpu
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def automaton(self, kind: str, dfa: ArrayDFA, constraint: dict = None) -> None:
+        """Record the size of an automaton; constraint automata are also listed one by one."""
+        states, transitions = len(dfa), dfa.table.size
+        self.add_automata(kind, {'count': 1, 'states': states, 'transitions': transitions,
+                                 'max_states': states, 'max_transitions': transitions})
+        if constraint is not None:
+            self.constraint_automata.append({
+                'template': constraint['template'], 'activities': constraint['activities'],
+                'states': states, 'transitions': transitions
+            })
+
+    def add_automata(self, kind: str, sizes: dict) -> None:
+        total = self.automata.setdefault(
+            kind, {'count': 0, 'states': 0, 'transitions': 0, 'max_states': 0, 'max_transitions': 0}
+        )
+        for key in ('count', 'states', 'transitions'):
+            total[key] += sizes[key]
+        for key in ('max_states', 'max_transitions'):
+            total[key] = max(total[key], sizes[key])
+
+    def record(self) -> dict:
+        """Picklable summary of a worker's profile, for merge."""
+        return {
+            'phases': self.phases,
+            'counts': self.counts,
+            'automata': self.automata,
+            'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
         }
-        
-        return result
-            
-    except Exception as e:
+
+    def merge(self, record: dict) -> None:
+        prefix = ''.join(f'{name}/' for name in self.stack)
+        for path, phase in record['phases'].items():
+            self.add_phase(prefix + path, phase['calls'], phase['wall'], phase['cpu'])
+        for name, amount in record['counts'].items():
+            self.count(name, amount)
+        for kind, sizes in record['automata'].items():
+            self.add_automata(kind, sizes)
+        self.worker_rss_kb = max(self.worker_rss_kb, record['peak_rss_kb'])
+
+    def metrics(self) -> dict:
+        """The "metrics" object of a profiled result; RSS figures are in megabytes."""
+        children_rss_kb = max(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss, self.worker_rss_kb)
         return {
-            "success": False,
-            "error": f"Unexpected error: {str(e)}",
-            "timestamp": datetime.now().isoformat()
+            'wall': round(self.wall, 6) if self.wall is not None else None,
+            'cpu': round(self.cpu, 6) if self.cpu is not None else None,
+            'phases': {
+                path: {'calls': phase['calls'], 'wall': round(phase['wall'], 6), 'cpu': round(phase['cpu'], 6)}
+                for path, phase in self.phases.items()
+            },
+            'counts': self.counts,
+            'automata': self.automata,
+            'constraint_automata': self.constraint_automata,
+            'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'peak_children_rss_mb': round(children_rss_kb / 1024, 1),
         }
-    
+
+
+# Profiler of the running analysis, installed by profiling(); None when not profiling
+PROFILER = None
+
+
+@contextmanager
+def profiling(profiler: Profiler, stats_path: str = None):
+    """Install profiler for the enclosed block and time the whole block.
+
+    With stats_path, the block also runs under cProfile and its pstats are
+    written there.
+    """
+    global PROFILER
+    previous, PROFILER = PROFILER, profiler
+    stats = cProfile.Profile() if stats_path else None
+    wall, cpu = time.perf_counter(), cpu_seconds()
+    if stats is not None:
+        stats.enable()
+    try:
+        yield profiler
     finally:
-        if temp_path and os.path.exists(temp_path):
-            os.remove(temp_path)
+        if stats is not None:
+            stats.disable()
+            stats.dump_stats(stats_path)
+        profiler.wall, profiler.cpu = time.perf_counter() - wall, cpu_seconds() - cpu
+        PROFILER = previous
 
-def main():
-    parser = argparse.ArgumentParser(description='Declare Model Analyzer')
-    parser.add_argument(
-        '--model',
-        type=str,
-        required=True,
-        help='Path or URL to the Declare model file'
-    )
-    parser.add_argument(
-        '--json-output',
-        action='store_true',
-        help='Output in JSON format'
-    )
 
+@contextmanager
+def profile_phase(name: str):
+    """Time the enclosed block as a phase of the running analysis, if it is profiled."""
+    if PROFILER is None:
+        yield
+        return
+    with PROFILER.phase(name):
+        yield
+
+
+def profile_count(name: str, amount: int = 1) -> None:
+    if PROFILER is not None:
+        PROFILER.count(name, amount)
+
+
+def profile_automaton(kind: str, dfa: ArrayDFA, constraint: dict = None) -> None:
+    if PROFILER is not None:
+        PROFILER.automaton(kind, dfa, constraint)
+
+
+def run_profiled(function, *args) -> tuple:
+    """Call function under a fresh Profiler, for pool tasks: returns (result, record)."""
+    global PROFILER
+    previous, PROFILER = PROFILER, Profiler()
     try:
-        args = parser.parse_args()
-        result = analyze_declare_model(args.model)
+        return function(*args), PROFILER.record()
+    finally:
+        PROFILER = previous
+
+
+def merge_profile(record: dict) -> None:
+    """Merge the record of a pool task (see run_profiled) into the running analysis."""
+    if PROFILER is not None:
+        PROFILER.merge(record)
+
+
+def run_mona(program: str, timeout: float = None) -> str:
+    """Run MONA on a program and return its automaton output.
+
+    ltlf2dfa's to_dfa always writes automa.mona inside its package directory, so
+    concurrent compilations overwrite each other's input; here every call gets its
+    own program file.
+    """
+    profile_count('mona_runs')
+    with tempfile.NamedTemporaryFile('w', suffix='.mona') as program_file, profile_phase('mona'):
+        program_file.write(program)
+        program_file.flush()
+        try:
+            completed = subprocess.run(
+                ['mona', '-q', '-u', '-w', program_file.name],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            raise TaskTimeout(f'MONA exceeded its {timeout}s deadline')
+
+    return completed.stdout.strip()
+
+
+def compile_mona_program(program: str, alphabet: frozenset, timeout: float = None) -> ArrayDFA:
+    """Compile a MONA program into a complete, minimal DFA over alphabet."""
+    mona_output = run_mona(program, timeout)
+    with profile_phase('parse_dfa'):
+        dfa = parse_mona_dfa(mona_output, frozenset(alphabet))
+    profile_automaton('compiled', dfa)
+    return dfa
+
+
+def dfa_record(dfa: ArrayDFA) -> dict:
+    """JSON-ready form of a DFA with states renumbered in BFS order."""
+    dfa = dfa.renumber()
+    return {
+        'alphabet': list(dfa.symbols),
+        'accepting': np.flatnonzero(dfa.accepting).tolist(),
+        'transitions': dfa.table.tolist(),
+    }
+
+
+def dfa_from_record(record: dict) -> ArrayDFA:
+    """Rebuild a DFA from its dfa_record."""
+    accepting = np.zeros(len(record['transitions']), dtype=bool)
+    accepting[record['accepting']] = True
+    return ArrayDFA(record['alphabet'], np.array(record['transitions'], dtype=np.int32), accepting)
+
+
+def serialize_dfa(dfa: ArrayDFA) -> bytes:
+    """Encode a DFA as compressed JSON with states renumbered in BFS order."""
+    return zlib.compress(json.dumps(dfa_record(dfa), separators=(',', ':')).encode('utf-8'))
+
+
+def deserialize_dfa(blob: bytes) -> ArrayDFA:
+    """Decode a DFA written by serialize_dfa."""
+    return dfa_from_record(json.loads(zlib.decompress(blob).decode('utf-8')))
+
+
+DEFAULT_DFA_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'ltlf_checker', 'dfa_cache.sqlite')
+DEFAULT_DFA_CACHE_MB = 256
+DEFAULT_DFA_MEMORY_ENTRIES = 4096
+
+# Bump whenever a change to how automata are compiled, read (parse_mona_dfa: one
+# activity per event, OTHER_SYMBOL for the rest) or serialized would change stored automata
+DFA_CACHE_VERSION = 1
+
+
+class DFACache(SQLiteLRUStore):
+    """Persistent, size-bounded LRU store of minimized automata.
+
+    Entries are content-addressed by the SHA-256 of DFA_CACHE_VERSION and the
+    normalized formula string and hold the automaton produced by serialize_dfa.
+    The most recently used automata are also kept deserialized in memory, which
+    keeps long-running processes warm; preload fills that memory from the store.
+    """
+
+    table = 'dfa_cache'
+    schema = (
+        'CREATE TABLE IF NOT EXISTS dfa_cache ('
+        'key TEXT PRIMARY KEY, formula TEXT NOT NULL, automaton BLOB NOT NULL, '
+        'size INTEGER NOT NULL, last_used REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS dfa_cache_last_used ON dfa_cache (last_used)',
+    )
+
+    def __init__(self, path: str = DEFAULT_DFA_CACHE_PATH, max_bytes: int = DEFAULT_DFA_CACHE_MB * 1024 * 1024,
+                 memory_entries: int = DEFAULT_DFA_MEMORY_ENTRIES):
+        super().__init__(path, max_bytes)
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+
+    @staticmethod
+    def make_key(formula: str) -> str:
+        return hashlib.sha256(json.dumps([DFA_CACHE_VERSION, formula]).encode('utf-8')).hexdigest()
+
+    def get(self, formula: str):
+        """Return the cached automaton for a normalized formula, or None."""
+        key = self.make_key(formula)
+        if key in self.memory:
+            self.hits += 1
+            self.memory.move_to_end(key)
+            return self.memory[key]
+
+        row = self.connection.execute('SELECT automaton FROM dfa_cache WHERE key = ?', (key,)).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.touch(key)
+        dfa = deserialize_dfa(row[0])
+        self.remember(key, dfa)
+        return dfa
+
+    def preload(self) -> int:
+        """Load the most recently used stored automata into memory; returns how many."""
+        rows = self.connection.execute(
+            'SELECT key, automaton FROM dfa_cache ORDER BY last_used DESC LIMIT ?', (self.memory_entries,)
+        ).fetchall()
+        for key, blob in reversed(rows):
+            self.remember(key, deserialize_dfa(blob))
+        return len(rows)
+
+    def remember(self, key: str, dfa: ArrayDFA) -> None:
+        self.memory[key] = dfa
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def put(self, formula: str, dfa: ArrayDFA) -> None:
+        """Store an automaton and evict least recently used entries over the size bound."""
+        key = self.make_key(formula)
+        blob = serialize_dfa(dfa)
+        self.connection.execute(
+            'INSERT OR REPLACE INTO dfa_cache (key, formula, automaton, size, last_used) VALUES (?, ?, ?, ?, ?)',
+            (key, formula, blob, len(blob), time.time())
+        )
+        self.remember(key, dfa)
+        self.evict()
+
+
+def compile_task(task: tuple) -> tuple:
+    """Pool entry point: compile a MONA program into a serialized DFA; returns it with a profile record.
+
+    The task holds (program, alphabet, task_timeout, expires_at). As in
+    leave_one_out_task, the timeout is taken when the task starts, and a
+    task that starts once expires_at has passed is skipped with a None automaton,
+    so the rest of a map interrupted by the deadline does not hold up the pool.
+    """
+    program, alphabet, task_timeout, expires_at = task
+    if deadline_passed(expires_at):
+        return None, Profiler().record()
+    dfa, record = run_profiled(compile_mona_program, program, alphabet, time_left(expires_at, task_timeout))
+    return serialize_dfa(dfa), record
+
+
+def get_formula_dfas(parsed_formulas: list, dfa_cache: DFACache = None, pool=None,
+                     task_timeout: float = None, expires_at: float = None) -> list:
+    """Return the minimal DFA of every parsed formula, compiling only cache misses.
+
+    Misses are compiled once per distinct formula, in the pool when one is given.
+    Raises TaskTimeout when the compilations do not finish by expires_at.
+    """
+    formulas = [str(parsed_formula) for parsed_formula in parsed_formulas]
+    dfas = [None] * len(formulas)
+    pending = {}
+
+    for index, formula in enumerate(formulas):
+        if formula in pending:
+            pending[formula].append(index)
+            continue
+        if dfa_cache is not None:
+            dfas[index] = dfa_cache.get(formula)
+        if dfas[index] is None:
+            pending[formula] = [index]
+    profile_count('dfa_cache_hits', sum(dfa is not None for dfa in dfas))
+
+    tasks = [
+        (MonaProgram(parsed_formulas[indices[0]]).mona_program(),
+         get_model_alphabet([parsed_formulas[indices[0]]]),
+         task_timeout, expires_at)
+        for indices in pending.values()
+    ]
+    profile_count('compilations', len(tasks))
+    with profile_phase('compile'):
+        if pool is not None:
+            compiled = []
+            for blob, record in pool.map(compile_task, tasks, chunksize=1):
+                merge_profile(record)
+                if blob is None:
+                    raise TaskTimeout('Compilation exceeded the deadline')
+                compiled.append(deserialize_dfa(blob))
+        else:
+            compiled = [
+                compile_mona_program(program, alphabet, time_left(expires_at, timeout))
+                for program, alphabet, timeout, _ in tasks
+            ]
+
+    for (formula, indices), dfa in zip(pending.items(), compiled):
+        if dfa_cache is not None:
+            dfa_cache.put(formula, dfa)
+        for index in indices:
+            dfas[index] = dfa
+
+    return dfas
+
+
+# Declare4Py rewrites digits in activity names (Utils.parse_activity), so the
+# placeholder activities are told apart by a letter.
+PLACEHOLDER_ACTIVITY = re.compile(r'activity([a-z])')
+
+# Minimal automata of the templates over placeholder activities, keyed by
+# (template, number of activities); filled on first use and backed by the DFA cache.
+TEMPLATE_LIBRARY = {}
+
+
+def get_template_dfas(keys: list, dfa_cache: DFACache = None, pool=None, task_timeout: float = None,
+                      expires_at: float = None) -> dict:
+    """Return the library automaton of every (template, arity) key that can be built.
+
+    Templates missing from TEMPLATE_LIBRARY are compiled once, over the activities
+    activitya, activityb, ..., through get_formula_dfas, so with dfa_cache each
+    template costs a single MONA call across processes and restarts.
+    """
+    parser = LTLfParser()
+    missing, parsed_formulas = [], []
+    profile_count('template_library_hits', len({key for key in keys if key in TEMPLATE_LIBRARY}))
+    for template, arity in dict.fromkeys(key for key in keys if key not in TEMPLATE_LIBRARY):
+        template_model = create_ltl_formula(template, [f"activity{chr(ord('a') + index)}" for index in range(arity)])
+        if template_model and template_model.formula:
+            missing.append((template, arity))
+            parsed_formulas.append(parser(template_model.formula.replace("[!]", "")))
+
+    for key, dfa in zip(missing, get_formula_dfas(parsed_formulas, dfa_cache, pool, task_timeout, expires_at)):
+        TEMPLATE_LIBRARY[key] = dfa
+    return {key: TEMPLATE_LIBRARY[key] for key in keys if key in TEMPLATE_LIBRARY}
+
+
+def get_constraint_dfas(ltlf_formulas: list, parsed_formulas: list, dfa_cache: DFACache = None, pool=None,
+                        task_timeout: float = None, expires_at: float = None) -> list:
+    """Return the minimal DFA of every constraint, instantiated from TEMPLATE_LIBRARY.
+
+    A library automaton is relabeled with the constraint's activities as they
+    appear in its formula. Constraints that repeat an activity, whose template
+    cannot be instantiated, or whose relabeled symbols differ from the formula's
+    atoms are compiled on their own (see get_formula_dfas).
+    """
+    activities = [
+        [Utils.parse_activity(format_activity_name(act)) for act in item['activities']] for item in ltlf_formulas
+    ]
+    keys = [
+        (item['template'], len(acts)) if len(set(acts)) == len(acts) else None
+        for item, acts in zip(ltlf_formulas, activities)
+    ]
+    library = get_template_dfas([key for key in keys if key is not None], dfa_cache, pool, task_timeout, expires_at)
+
+    dfas = [None] * len(ltlf_formulas)
+    for index, (key, acts) in enumerate(zip(keys, activities)):
+        if key not in library:
+            continue
+        template_dfa = library[key]
+        labels = {
+            symbol: PLACEHOLDER_ACTIVITY.sub(lambda match: acts[ord(match.group(1)) - ord('a')], symbol)
+            for symbol in template_dfa.input_symbols - {OTHER_SYMBOL}
+        }
+        if set(labels.values()) == {str(label) for label in parsed_formulas[index].find_labels()}:
+            dfas[index] = template_dfa.relabel(labels)
+
+    fallback = [index for index, dfa in enumerate(dfas) if dfa is None]
+    profile_count('relabeled_constraints', len(dfas) - len(fallback))
+    compiled = get_formula_dfas(
+        [parsed_formulas[index] for index in fallback], dfa_cache, pool, task_timeout, expires_at
+    )
+    for index, dfa in zip(fallback, compiled):
+        dfas[index] = dfa
+    for item, dfa in zip(ltlf_formulas, dfas):
+        profile_automaton('constraint', dfa, item)
+    return dfas
+
+
+def build_prefix_products(dfas: list, alphabet: frozenset) -> list:
+    """Return minimized products of every prefix of the constraint list.
+
+    prefixes[i] accepts the traces satisfying dfas[:i]; prefixes[-1] is the
+    automaton of the whole model.
+    """
+    prefixes = [ArrayDFA.universal(alphabet)]
+    for dfa in dfas:
+        prefixes.append(prefixes[-1].intersection(dfa))
+        profile_automaton('product', prefixes[-1])
+    return prefixes
+
+
+def build_suffix_products(dfas: list, alphabet: frozenset) -> list:
+    """Return minimized products of every suffix of the constraint list.
+
+    suffixes[i] accepts the traces satisfying dfas[i:], so the model without
+    constraint i is prefixes[i] & suffixes[i + 1].
+    """
+    suffixes = [ArrayDFA.universal(alphabet)]
+    for dfa in reversed(dfas):
+        suffixes.append(suffixes[-1].intersection(dfa))
+        profile_automaton('product', suffixes[-1])
+    suffixes.reverse()
+    return suffixes
+
+
+def padding_flags(dfa: ArrayDFA) -> tuple:
+    """Describe how OTHER_SYMBOL events around a trace affect its acceptance.
+
+    Returns (prefix_ok, suffix_ok, suffix_exact): events before a trace never
+    change its verdict, events after an accepted trace keep it accepted, and
+    events after any trace never change its verdict. Exact on minimal automata,
+    conservative otherwise.
+    """
+    moves = dfa.table[:, dfa.index[OTHER_SYMBOL]]
+    prefix_ok = bool(moves[0] == 0)
+    suffix_ok = bool(dfa.accepting[moves[dfa.accepting]].all())
+    suffix_exact = suffix_ok and not dfa.accepting[moves[~dfa.accepting]].any()
+    return prefix_ok, suffix_ok, suffix_exact
+
+
+def find_constraint_components(ltlf_formulas: list) -> list:
+    """Group constraint indices into components connected by shared activities.
+
+    Mirrors analyzeWeaklyConnectedComponents in metrics.js, on the formatted
+    activity names; components are ordered by their first constraint.
+    """
+    parent = {}
+
+    def find(activity):
+        parent.setdefault(activity, activity)
+        while parent[activity] != activity:
+            parent[activity] = parent[parent[activity]]
+            activity = parent[activity]
+        return activity
+
+    for item in ltlf_formulas:
+        activities = [format_activity_name(act) for act in item['activities']]
+        for activity in activities[1:]:
+            parent[find(activity)] = find(activities[0])
+
+    components = OrderedDict()
+    for index, item in enumerate(ltlf_formulas):
+        components.setdefault(find(format_activity_name(item['activities'][0])), []).append(index)
+    return list(components.values())
+
+
+def can_concatenate(flags: list) -> bool:
+    """Whether nonempty automata over disjoint activities always share an accepted trace.
+
+    Their witnesses are concatenated, each automaton reading the others' events
+    as OTHER_SYMBOL: one automaton that is not prefix_ok can go first and one
+    that is not suffix_ok last.
+    """
+    if len(flags) <= 1:
+        return True
+    no_prefix = {index for index, flag in enumerate(flags) if not flag[0]}
+    no_suffix = {index for index, flag in enumerate(flags) if not flag[1]}
+    return len(no_prefix) <= 1 and len(no_suffix) <= 1 and not no_prefix & no_suffix
+
+
+def leave_one_out_is_exact(component: int, loo_flags: tuple, component_flags: list) -> bool:
+    """Whether a per-component "not redundant" verdict also holds for the whole model.
+
+    A trace accepted without the constraint but rejected by the component is
+    lifted to the model by concatenating witnesses of the other components
+    around it, which is sound when it can be placed last or first.
+    """
+    if len(component_flags) == 1:
+        return True
+
+    own = component_flags[component]
+    others = component_flags[:component] + component_flags[component + 1:]
+    as_last = own[0] and loo_flags[0] and all(flag[1] for flag in others) and sum(not flag[0] for flag in others) <= 1
+    as_first = own[2] and loo_flags[1] and all(flag[0] for flag in others) and sum(not flag[1] for flag in others) <= 1
+    return as_last or as_first
+
+
+class ComponentProducts:
+    """Products of component automata over the whole model alphabet.
+
+    Built lazily, only for the checks that cannot be decided per component.
+    """
+
+    def __init__(self, component_dfas: list, alphabet: frozenset):
+        self.component_dfas = component_dfas
+        self.alphabet = alphabet
+        self.prefixes = None
+        self.suffixes = None
+
+    def build(self) -> None:
+        if self.prefixes is None:
+            lifted = [dfa.lift(self.alphabet) for dfa in self.component_dfas]
+            self.prefixes = build_prefix_products(lifted, self.alphabet)
+            self.suffixes = build_suffix_products(lifted, self.alphabet)
+
+    def model_dfa(self) -> ArrayDFA:
+        self.build()
+        return self.prefixes[-1]
+
+    def others(self, component: int) -> ArrayDFA:
+        self.build()
+        return self.prefixes[component].intersection(self.suffixes[component + 1])
+
+
+def check_leave_one_out(prefix: ArrayDFA, suffix: ArrayDFA, model_dfa: ArrayDFA, timeout: float = None) -> tuple:
+    """Compare prefix & suffix with the model automaton.
+
+    Returns whether they accept the same language together with the padding_flags
+    of prefix & suffix, or (None, None) when the check ran past timeout.
+    """
+    profile_count('leave_one_out_checks')
+    try:
+        with task_deadline(timeout):
+            loo_dfa = prefix.intersection(suffix)
+            profile_automaton('leave_one_out', loo_dfa)
+            return loo_dfa == model_dfa, padding_flags(loo_dfa)
+    except TaskTimeout:
+        profile_count('leave_one_out_timeouts')
+        return None, None
+
+
+def leave_one_out_task(task: tuple) -> tuple:
+    """Pool entry point: run check_leave_one_out on serialized automata; returns its result and a profile record.
+
+    The task's timeout is taken from task_timeout and expires_at when it starts,
+    not when it was queued, and a task that starts once expires_at has passed is
+    skipped as unchecked.
+    """
+    prefix_blob, suffix_blob, model_blob, task_timeout, expires_at = task
+    if deadline_passed(expires_at):
+        return (None, None), Profiler().record()
+    return run_profiled(
+        check_leave_one_out,
+        deserialize_dfa(prefix_blob), deserialize_dfa(suffix_blob), deserialize_dfa(model_blob),
+        time_left(expires_at, task_timeout)
+    )
+
+
+def format_constraints(items: list) -> list:
+    """Deduplicate constraint entries and keep only their template and activities."""
+    items = list({json.dumps(d, sort_keys=True): d for d in items}.values())
+    return [{'template': item['template'], 'activities': item['activities']} for item in items]
+
+
+# A constraint of the key template implies the listed templates over its
+# activities taken in the given order. The rules follow the formulas built by
+# create_ltl_formula rather than the Declare literature: their Chain Precedence
+# and Not Chain Response use a strong next, so e.g. Chain Precedence does not
+# imply Precedence and Not Response does not imply Not Chain Response.
+TEMPLATE_IMPLICATIONS = {
+    "Init": [("Existence", (0,))],
+    "Exactly1": [("Existence", (0,)), ("Absence2", (0,))],
+    "Exactly2": [("Existence2", (0,)), ("Absence3", (0,))],
+    "Existence3": [("Existence2", (0,))],
+    "Existence2": [("Existence", (0,))],
+    "Absence": [("Absence2", (0,))],
+    "Absence2": [("Absence3", (0,))],
+    "Chain Succession": [("Chain Response", (0, 1)), ("Chain Precedence", (0, 1))],
+    "Alternate Succession": [("Alternate Response", (0, 1)), ("Alternate Precedence", (0, 1)), ("Succession", (0, 1))],
+    "Succession": [("Response", (0, 1)), ("Precedence", (0, 1)), ("Co-Existence", (0, 1))],
+    "Chain Response": [("Alternate Response", (0, 1))],
+    "Alternate Response": [("Response", (0, 1))],
+    "Response": [("Responded Existence", (0, 1))],
+    "Alternate Precedence": [("Precedence", (0, 1))],
+    "Precedence": [("Responded Existence", (1, 0))],
+    "Co-Existence": [("Co-Existence", (1, 0)), ("Responded Existence", (0, 1))],
+    "Exclusive Choice": [("Exclusive Choice", (1, 0)), ("Choice", (0, 1)), ("Not Co-Existence", (0, 1))],
+    "Choice": [("Choice", (1, 0))],
+    "Not Co-Existence": [("Not Co-Existence", (1, 0)), ("Not Succession", (0, 1))],
+    "Not Succession": [("Not Response", (0, 1)), ("Not Chain Succession", (0, 1))],
+    "Not Responded Existence": [("Not Responded Existence", (1, 0)), ("Not Response", (0, 1))],
+    "Not Response": [("Not Precedence", (0, 1)), ("Not Chain Precedence", (0, 1))],
+    "Not Precedence": [("Not Response", (0, 1))],
+    "Not Chain Response": [("Not Chain Precedence", (0, 1))],
+}
+
+
+def close_template_implications(implications: dict) -> dict:
+    """Reflexive and transitive closure of a template implication table.
+
+    Maps each template to the set of (template, activity order) pairs it implies.
+    """
+    closure = {}
+    for template, implied in implications.items():
+        identity = tuple(range(len(implied[0][1])))
+        reached = {(template, identity)}
+        pending = [(template, identity)]
+        while pending:
+            current, order = pending.pop()
+            for target, positions in implications.get(current, ()):
+                step = (target, tuple(order[position] for position in positions))
+                if step not in reached:
+                    reached.add(step)
+                    pending.append(step)
+        closure[template] = reached
+    return closure
+
+
+IMPLIED_TEMPLATES = close_template_implications(TEMPLATE_IMPLICATIONS)
+
+
+def find_subsumed_constraints(ltlf_formulas: list) -> list:
+    """Find the constraints implied by another constraint of the model via IMPLIED_TEMPLATES.
+
+    Returns, in model order, the index of an implying constraint or None.
+    """
+    keys = OrderedDict()
+    activities = []
+    for index, item in enumerate(ltlf_formulas):
+        activities.append(tuple(format_activity_name(act) for act in item['activities']))
+        keys.setdefault((item['template'], activities[index]), []).append(index)
+
+    subsumed = [None] * len(ltlf_formulas)
+    for index, item in enumerate(ltlf_formulas):
+        identity = tuple(range(len(activities[index])))
+        for template, order in IMPLIED_TEMPLATES.get(item['template'], {(item['template'], identity)}):
+            if max(order) >= len(activities[index]):
+                continue
+            for implied in keys.get((template, tuple(activities[index][position] for position in order)), ()):
+                if implied != index and subsumed[implied] is None:
+                    subsumed[implied] = index
+    return subsumed
+
+
+def collect_verdicts(ltlf_formulas: list, verdicts: list, subsumed: list, method: str, seeds: list = None) -> tuple:
+    """Merge search verdicts with find_subsumed_constraints' output.
+
+    verdicts holds True (redundant), False or None (not decided) per constraint
+    and method names the check that produced them; the verdicts also given in
+    seeds came from the result store. Returns the redundant and the undecided
+    constraints and the decisions list described in check_model.
+    """
+    seeds = seeds or [None] * len(ltlf_formulas)
+    decisions = []
+    for item, verdict, implying, seed in zip(ltlf_formulas, verdicts, subsumed, seeds):
+        decision = {'template': item['template'], 'activities': item['activities']}
+        if implying is not None:
+            implied_by = ltlf_formulas[implying]
+            decision.update(redundant=True, method='subsumption', implied_by={
+                'template': implied_by['template'], 'activities': implied_by['activities']
+            })
+        elif seed is not None:
+            decision.update(redundant=seed, method='result_store')
+        elif verdict is not None:
+            decision.update(redundant=verdict, method=method)
+        else:
+            continue
+        decisions.append(decision)
+    decisions = list({json.dumps(d, sort_keys=True): d for d in decisions}.values())
+
+    redundant_cons = [item for item, verdict, implying in zip(ltlf_formulas, verdicts, subsumed)
+                      if verdict or implying is not None]
+    unchecked_cons = [item for item, verdict, implying in zip(ltlf_formulas, verdicts, subsumed)
+                      if verdict is None and implying is None]
+    return format_constraints(redundant_cons), format_constraints(unchecked_cons), decisions
+
+
+class ComponentAutomata:
+    """Automata of one component of a ModelAnalysis.
+
+    ids are the constraint ids of the component in product order and dfas their
+    automata over the component alphabet. prefixes and suffixes are the products
+    of build_prefix_products and build_suffix_products, the latter built on first
+    use, and outcomes[j] is the check_leave_one_out result of position j, or None
+    until it has been checked.
+    """
+
+    def __init__(self, ids: list, dfas: list, alphabet: frozenset, prefixes: list = None):
+        self.ids = ids
+        self.dfas = dfas
+        self.alphabet = alphabet
+        # prefixes of a component merged into this one are extended, not rebuilt
+        self.prefixes = prefixes or [ArrayDFA.universal(alphabet)]
+        for dfa in dfas[len(self.prefixes) - 1:]:
+            self.prefixes.append(self.prefixes[-1].intersection(dfa))
+            profile_automaton('product', self.prefixes[-1])
+        self.suffixes = None
+        self.outcomes = [None] * len(ids)
+        self.flags = padding_flags(self.prefixes[-1])
+
+    def model_dfa(self) -> ArrayDFA:
+        return self.prefixes[-1]
+
+    def build_suffixes(self) -> None:
+        if self.suffixes is None:
+            self.suffixes = build_suffix_products(self.dfas, self.alphabet)
+
+    def check_cost(self, position: int) -> int:
+        return len(self.prefixes[position]) * len(self.suffixes[position + 1])
+
+    def to_record(self) -> dict:
+        return {
+            'ids': self.ids,
+            'prefixes': [dfa_record(dfa) for dfa in self.prefixes],
+            'suffixes': [dfa_record(dfa) for dfa in self.suffixes] if self.suffixes is not None else None,
+            'outcomes': self.outcomes,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict, dfas: list, alphabet: frozenset) -> 'ComponentAutomata':
+        """Rebuild a component written by to_record; dfas are its automata, in record['ids'] order."""
+        automata = cls(record['ids'], dfas, alphabet, [dfa_from_record(dfa) for dfa in record['prefixes']])
+        if record['suffixes'] is not None:
+            automata.suffixes = [dfa_from_record(dfa) for dfa in record['suffixes']]
+        automata.outcomes = [tuple(outcome) if outcome is not None else None for outcome in record['outcomes']]
+        return automata
+
+
+ANALYSIS_STATE_VERSION = 2
+
+
+class ModelAnalysis:
+    """Compiled automata of a model, kept to re-analyze it after edits.
+
+    Holds the constraint automata and, per component (see
+    find_constraint_components), a ComponentAutomata with its products and
+    leave-one-out outcomes. edit adds and removes constraints and rebuilds only
+    the components they touch: an unchanged component keeps its products and
+    outcomes, and a component grown by an edit extends the prefix products of
+    the largest component merged into it. check then decides the edited model,
+    running only the leave-one-out checks that are not known yet.
+    """
+
+    def __init__(self):
+        self.ltlf_formulas = []
+        self.parsed_formulas = []
+        self.ids = []
+        self.dfas = []
+        self.components = []
+        self.automata = []
+        self.next_id = 0
+        self.rebuilt = 0
+
+    def kept_indices(self, removed: list) -> list:
+        """Return the indices of the constraints left once removed is taken out.
+
+        Each (template, activities) pair takes out the first matching constraint
+        still kept, so a duplicated constraint loses one copy per pair.
+        """
+        kept = list(range(len(self.ltlf_formulas)))
+        for template_name, activities in removed:
+            fingerprint = constraint_fingerprint(template_name, activities)
+            index = next((index for index in kept if constraint_fingerprint(
+                self.ltlf_formulas[index]['template'], self.ltlf_formulas[index]['activities']
+            ) == fingerprint), None)
+            if index is None:
+                raise ValueError(f"Constraint {template_name}[{', '.join(activities)}] is not in the model")
+            kept.remove(index)
+        return kept
+
+    def edit(self, added: list = (), removed: list = (), dfa_cache: DFACache = None, pool=None,
+             task_timeout: float = None, expires_at: float = None) -> None:
+        """Remove then add constraints, recomputing only the components they touch.
+
+        removed holds (template, activities) pairs, each removing one matching
+        constraint; added holds ltlf_formulas items, whose automata are compiled
+        in one pass. The analysis is left unchanged when the edit fails.
+        """
+        kept = self.kept_indices(removed)
+
+        added = list(added)
+        with profile_phase('parse'):
+            parser = LTLfParser()
+            added_parsed = [parser(item['formula'].replace("[!]", "")) for item in added]
+        with profile_phase('constraint_automata'):
+            added_dfas = get_constraint_dfas(
+                added, added_parsed, dfa_cache, pool, task_timeout, expires_at
+            ) if added else []
+
+        ltlf_formulas = [self.ltlf_formulas[index] for index in kept] + added
+        parsed_formulas = [self.parsed_formulas[index] for index in kept] + added_parsed
+        ids = [self.ids[index] for index in kept] + list(range(self.next_id, self.next_id + len(added)))
+        dfas = [self.dfas[index] for index in kept] + added_dfas
+        position = {identifier: index for index, identifier in enumerate(ids)}
+        previous = {frozenset(component.ids): component for component in self.automata}
+
+        components, automata, rebuilt = [], [], 0
+        with profile_phase('components'):
+            for component in find_constraint_components(ltlf_formulas):
+                members = frozenset(ids[index] for index in component)
+                component_automata = previous.get(members)
+                if component_automata is None:
+                    rebuilt += 1
+                    alphabet = get_model_alphabet([parsed_formulas[index] for index in component])
+                    base = max(
+                        (old for key, old in previous.items() if key < members), key=lambda old: len(old.ids),
+                        default=None
+                    )
+                    order = list(base.ids) if base is not None else []
+                    order += [ids[index] for index in component if ids[index] not in set(order)]
+                    component_automata = ComponentAutomata(
+                        order, [dfas[position[identifier]].lift(alphabet) for identifier in order], alphabet,
+                        [dfa.lift(alphabet) for dfa in base.prefixes] if base is not None else None
+                    )
+                components.append([position[identifier] for identifier in component_automata.ids])
+                automata.append(component_automata)
+        profile_count('rebuilt_components', rebuilt)
+
+        self.ltlf_formulas, self.parsed_formulas, self.ids, self.dfas = ltlf_formulas, parsed_formulas, ids, dfas
+        self.components, self.automata = components, automata
+        self.next_id += len(added)
+        self.rebuilt = rebuilt
+
+    def check(self, pool=None, task_timeout: float = None, expires_at: float = None, seeds: list = None,
+              subsumed: list = None) -> tuple:
+        """Decide the model as check_model does, reusing the outcomes already known.
+
+        subsumed is the output of find_subsumed_constraints, computed here when not given.
+        """
+        if not self.ltlf_formulas:
+            return True, [], [], []
+        seeds = seeds or [None] * len(self.ltlf_formulas)
+        if subsumed is None:
+            with profile_phase('subsumption'):
+                subsumed = find_subsumed_constraints(self.ltlf_formulas)
+        profile_count('subsumed', sum(implying is not None for implying in subsumed))
+        component_flags = [component.flags for component in self.automata]
+        products = ComponentProducts(
+            [component.model_dfa() for component in self.automata], get_model_alphabet(self.parsed_formulas)
+        )
+
+        try:
+            with task_deadline(time_left(expires_at)), profile_phase('satisfiability'):
+                if any(component.model_dfa().isempty() for component in self.automata):
+                    return False, [], [], []
+                if not can_concatenate(component_flags) and products.model_dfa().isempty():
+                    return False, [], [], []
+        except TaskTimeout:
+            return (None, *collect_verdicts(self.ltlf_formulas, [None] * len(self.ltlf_formulas), subsumed, 'automata'))
+
+        verdicts = list(seeds)
+        try:
+            with task_deadline(time_left(expires_at)), profile_phase('suffixes'):
+                for component in self.automata:
+                    component.build_suffixes()
+        except TaskTimeout:
+            return (True, *collect_verdicts(self.ltlf_formulas, verdicts, subsumed, 'automata', seeds))
+
+        # Cheapest checks first, so that a deadline leaves the costliest ones unchecked
+        checks = sorted(
+            ((k, j) for k, component in enumerate(self.components) for j, index in enumerate(component)
+             if subsumed[index] is None and seeds[index] is None and self.automata[k].outcomes[j] is None),
+            key=lambda check: self.automata[check[0]].check_cost(check[1])
+        )
+
+        with profile_phase('leave_one_out'):
+            if pool is not None:
+                component_blobs = [serialize_dfa(component.model_dfa()) for component in self.automata]
+                tasks = [
+                    (serialize_dfa(self.automata[k].prefixes[j]), serialize_dfa(self.automata[k].suffixes[j + 1]),
+                     component_blobs[k], task_timeout, expires_at)
+                    for k, j in checks
+                ]
+                outcomes = []
+                for outcome, record in pool.map(leave_one_out_task, tasks, chunksize=1):
+                    merge_profile(record)
+                    outcomes.append(outcome)
+            else:
+                outcomes = []
+                for k, j in checks:
+                    if deadline_passed(expires_at):
+                        break
+                    component = self.automata[k]
+                    outcomes.append(check_leave_one_out(
+                        component.prefixes[j], component.suffixes[j + 1], component.model_dfa(),
+                        time_left(expires_at, task_timeout)
+                    ))
+        for (k, j), outcome in zip(checks, outcomes):
+            if outcome[0] is not None:
+                self.automata[k].outcomes[j] = outcome
+
+        for k, (component, component_automata) in enumerate(zip(self.components, self.automata)):
+            for j, index in enumerate(component):
+                if subsumed[index] is not None or seeds[index] is not None or component_automata.outcomes[j] is None:
+                    continue
+                verdict, loo_flags = component_automata.outcomes[j]
+                if verdict is False and not leave_one_out_is_exact(k, loo_flags, component_flags):
+                    if deadline_passed(expires_at):
+                        continue
+                    with profile_phase('cross_component'):
+                        loo_dfa = component_automata.prefixes[j].intersection(
+                            component_automata.suffixes[j + 1]
+                        ).lift(products.alphabet)
+                        verdict, _ = check_leave_one_out(
+                            loo_dfa, products.others(k), products.model_dfa(), time_left(expires_at, task_timeout)
+                        )
+                verdicts[index] = verdict
+
+        return (True, *collect_verdicts(self.ltlf_formulas, verdicts, subsumed, 'automata', seeds))
+
+    def save(self, path: str) -> None:
+        """Write the analysis to path as compressed JSON."""
+        record = {
+            'version': ANALYSIS_STATE_VERSION,
+            'ltlf_formulas': self.ltlf_formulas,
+            'ids': self.ids,
+            'next_id': self.next_id,
+            'dfas': [dfa_record(dfa) for dfa in self.dfas],
+            'automata': [component.to_record() for component in self.automata],
+        }
+        with open(path, 'wb') as state_file:
+            state_file.write(zlib.compress(json.dumps(record, separators=(',', ':')).encode('utf-8')))
+
+    @classmethod
+    def load(cls, path: str) -> 'ModelAnalysis':
+        """Read an analysis written by save."""
+        with open(path, 'rb') as state_file:
+            record = json.loads(zlib.decompress(state_file.read()).decode('utf-8'))
+        if record.get('version') != ANALYSIS_STATE_VERSION:
+            raise ValueError(f'Unsupported analysis state version: {record.get("version")}')
+
+        analysis = cls()
+        parser = LTLfParser()
+        analysis.ltlf_formulas = record['ltlf_formulas']
+        analysis.parsed_formulas = [parser(item['formula'].replace("[!]", "")) for item in analysis.ltlf_formulas]
+        analysis.ids = record['ids']
+        analysis.next_id = record['next_id']
+        analysis.dfas = [dfa_from_record(dfa) for dfa in record['dfas']]
+        position = {identifier: index for index, identifier in enumerate(analysis.ids)}
+        for component_record in record['automata']:
+            component = [position[identifier] for identifier in component_record['ids']]
+            alphabet = get_model_alphabet([analysis.parsed_formulas[index] for index in component])
+            dfas = [analysis.dfas[index].lift(alphabet) for index in component]
+            analysis.components.append(component)
+            analysis.automata.append(ComponentAutomata.from_record(component_record, dfas, alphabet))
+        return analysis
+
+
+def check_model(ltlf_formulas: list, dfa_cache: DFACache = None, workers: int = 1,
+                task_timeout: float = None, pool=None, expires_at: float = None, seeds: list = None,
+                analysis: ModelAnalysis = None) -> tuple:
+    """Decide satisfiability and redundancy from a single compilation of the model.
+
+    Constraints are split into components that share no activities and each
+    component is analyzed on its own, smaller alphabet. Constraint automata are
+    instantiated from the template library (see get_constraint_dfas), so MONA only
+    runs once per template and for the few constraints it cannot cover. The last prefix
+    product of a component is its minimized automaton: the model is satisfiable iff
+    the components have a common accepted trace, which is decided per component
+    unless positional constraints such as Init prevent concatenating their
+    witnesses (see can_concatenate). The component automaton is also the reference
+    language of the leave-one-out checks of its constraints, which are assembled
+    from cached prefix and suffix products instead of recompiling N-1
+    conjunctions; verdicts that do not carry over to the whole model are re-checked
+    against the cross-component products. With workers > 1 the compilations and
+    leave-one-out checks are spread over a process pool; a caller-owned pool can
+    be passed in to reuse warm workers. An empty ModelAnalysis passed as analysis
+    keeps the compiled automata, so the model can later be edited and re-checked.
+
+    Constraints implied by another constraint through the template lattice (see
+    find_subsumed_constraints) are reported as redundant without a leave-one-out
+    check. They still take part in the model automaton, so the verdicts of the
+    remaining constraints are the same as without the pre-filter. The same holds
+    for seeds, verdicts (True, False or None per constraint) that ResultStore.seeds
+    carried over from stored analyses of related models.
+
+    Redundancy is deliberately not checked for unsatisfiable models. Any
+    constraint whose removal leaves the model unsatisfiable would count as
+    redundant, which tells the modeler nothing, so no constraint is reported
+    and the result sets redundancy_checked to false (see analysis_result).
+
+    expires_at is a time.monotonic() instant bounding the whole analysis. Its
+    phases run in order of cost: the subsumption pre-filter, the compilation of
+    the automata and the satisfiability check, then the leave-one-out checks from
+    the smallest products up. Each task is bounded by the remaining budget and no
+    check starts once it is spent, so the constraints decided so far are returned
+    with the others left unchecked. When the compilation or the satisfiability
+    check does not finish in time, is_satisfiable is None and only the constraints
+    decided by the pre-filter are reported.
+
+    Returns (is_satisfiable, redundant constraints, constraints whose check ran past
+    task_timeout or expires_at, decisions), the lists in model order. decisions
+    records for every decided constraint whether it is redundant and the method
+    that decided it, "subsumption" (with the implying constraint), "result_store"
+    or "automata".
+    """
+    if not ltlf_formulas:
+        return True, [], [], []
+
+    with profile_phase('subsumption'):
+        subsumed = find_subsumed_constraints(ltlf_formulas)
+    analysis = analysis if analysis is not None else ModelAnalysis()
+    owns_pool = pool is None and workers > 1
+    if owns_pool:
+        pool = multiprocessing.Pool(workers)
+    try:
+        try:
+            with task_deadline(time_left(expires_at)), profile_phase('edit'):
+                analysis.edit(ltlf_formulas, (), dfa_cache, pool, task_timeout, expires_at)
+        except TaskTimeout:
+            profile_count('subsumed', sum(implying is not None for implying in subsumed))
+            return (None, *collect_verdicts(ltlf_formulas, [None] * len(ltlf_formulas), subsumed, 'automata'))
+        with profile_phase('check'):
+            return analysis.check(pool, task_timeout, expires_at, seeds, subsumed)
+    finally:
+        if owns_pool:
+            pool.terminate()
+
+
+def check_semantical_redundacy(ltlf_formulas: list, dfa_cache: DFACache = None, workers: int = 1,
+                               task_timeout: float = None, pool=None) -> tuple:
+    """Return the redundant and the timed-out constraints of a model (see check_model)."""
+    _, redundant_cons, unchecked_cons, _ = check_model(ltlf_formulas, dfa_cache, workers, task_timeout, pool)
+    return redundant_cons, unchecked_cons
+
+
+class FormulaTable:
+    """Hash-consed LTLf formulas in negation normal form, with memoized progression.
+
+    Every distinct formula is stored once and named by an integer, so progression
+    states hash and compare in constant time and are shared by all the checks of a
+    model. Traces are non-empty and carry one activity per event, as in
+    get_model_alphabet.
+    """
+
+    TRUE = 0
+    FALSE = 1
+    DUALS = {
+        'atom': 'not', 'not': 'atom', 'and': 'or', 'or': 'and', 'next': 'wnext', 'wnext': 'next',
+        'until': 'release', 'release': 'until', 'eventually': 'always', 'always': 'eventually',
+    }
+
+    def __init__(self):
+        self.nodes = [('true',), ('false',)]
+        self.ids = {node: index for index, node in enumerate(self.nodes)}
+        self.negations = {self.TRUE: self.FALSE, self.FALSE: self.TRUE}
+        self.progressions = {}
+        self.last = {}
+
+    def make(self, *node) -> int:
+        index = self.ids.get(node)
+        if index is None:
+            index = self.ids[node] = len(self.nodes)
+            self.nodes.append(node)
+        return index
+
+    def junction(self, op: str, operands) -> int:
+        absorbing, neutral = (self.FALSE, self.TRUE) if op == 'and' else (self.TRUE, self.FALSE)
+        flat = set()
+        for operand in operands:
+            if operand == absorbing:
+                return absorbing
+            if operand == neutral:
+                continue
+            node = self.nodes[operand]
+            if node[0] == op:
+                flat.update(node[1])
+            else:
+                flat.add(operand)
+        if not flat:
+            return neutral
+        if len(flat) == 1:
+            return flat.pop()
+        return self.make(op, frozenset(flat))
+
+    def conjunction(self, *operands) -> int:
+        return self.junction('and', operands)
+
+    def disjunction(self, *operands) -> int:
+        return self.junction('or', operands)
+
+    def negate(self, index: int) -> int:
+        if index not in self.negations:
+            op, *args = self.nodes[index]
+            if op in ('atom', 'not'):
+                negation = self.make(self.DUALS[op], args[0])
+            elif op in ('and', 'or'):
+                negation = self.junction(self.DUALS[op], [self.negate(arg) for arg in args[0]])
+            else:
+                negation = self.make(self.DUALS[op], *[self.negate(arg) for arg in args])
+            self.negations[index] = negation
+            self.negations[negation] = index
+        return self.negations[index]
+
+    def from_ltlf(self, formula) -> int:
+        """Translate an ltlf2dfa formula."""
+        if isinstance(formula, LTLfTrue):
+            return self.TRUE
+        if isinstance(formula, LTLfFalse):
+            return self.FALSE
+        if isinstance(formula, LTLfAtomic):
+            return self.make('atom', str(formula.s))
+        if isinstance(formula, LTLfNot):
+            return self.negate(self.from_ltlf(formula.f))
+        if isinstance(formula, LTLfAnd):
+            return self.conjunction(*[self.from_ltlf(f) for f in formula.formulas])
+        if isinstance(formula, LTLfOr):
+            return self.disjunction(*[self.from_ltlf(f) for f in formula.formulas])
+        if isinstance(formula, LTLfImplies):
+            operands = [self.from_ltlf(f) for f in formula.formulas]
+            result = operands[0]
+            for operand in operands[1:]:
+                result = self.disjunction(self.negate(result), operand)
+            return result
+        if isinstance(formula, LTLfEquivalence):
+            operands = [self.from_ltlf(f) for f in formula.formulas]
+            return self.disjunction(
+                self.conjunction(*operands), self.conjunction(*[self.negate(operand) for operand in operands])
+            )
+        if isinstance(formula, (LTLfUntil, LTLfRelease)):
+            op = 'until' if isinstance(formula, LTLfUntil) else 'release'
+            operands = [self.from_ltlf(f) for f in formula.formulas]
+            result = operands[-1]
+            for operand in reversed(operands[:-1]):
+                result = self.make(op, operand, result)
+            return result
+        if isinstance(formula, LTLfNext):
+            return self.make('next', self.from_ltlf(formula.f))
+        if isinstance(formula, LTLfWeakNext):
+            return self.make('wnext', self.from_ltlf(formula.f))
+        if isinstance(formula, LTLfEventually):
+            return self.make('eventually', self.from_ltlf(formula.f))
+        if isinstance(formula, LTLfAlways):
+            return self.make('always', self.from_ltlf(formula.f))
+        if isinstance(formula, LTLfLast):
+            return self.make('wnext', self.FALSE)
+        if isinstance(formula, LTLfEnd):
+            return self.FALSE
+        raise ValueError(f"Unsupported LTLf operator: {type(formula).__name__}")
+
+    def progress(self, index: int, symbol: str) -> int:
+        """Return what must hold from the next event on, after reading symbol."""
+        key = (index, symbol)
+        if key not in self.progressions:
+            op, *args = self.nodes[index]
+            if op in ('true', 'false'):
+                result = index
+            elif op == 'atom':
+                result = self.TRUE if args[0] == symbol else self.FALSE
+            elif op == 'not':
+                result = self.FALSE if args[0] == symbol else self.TRUE
+            elif op in ('and', 'or'):
+                # Progressions of the operands are mostly memoized already; the junction
+                # stops at the first absorbing operand
+                memo = self.progressions
+                result = self.junction(op, (
+                    memo[arg, symbol] if (arg, symbol) in memo else self.progress(arg, symbol) for arg in args[0]
+                ))
+            elif op in ('next', 'wnext'):
+                result = args[0]
+            elif op == 'until':
+                result = self.disjunction(
+                    self.progress(args[1], symbol), self.conjunction(self.progress(args[0], symbol), index)
+                )
+            elif op == 'release':
+                result = self.conjunction(
+                    self.progress(args[1], symbol), self.disjunction(self.progress(args[0], symbol), index)
+                )
+            elif op == 'eventually':
+                result = self.disjunction(self.progress(args[0], symbol), index)
+            else:
+                result = self.conjunction(self.progress(args[0], symbol), index)
+            self.progressions[key] = result
+        return self.progressions[key]
+
+    def holds_last(self, index: int, symbol: str) -> bool:
+        """Whether the formula holds on the one-event trace symbol."""
+        key = (index, symbol)
+        if key not in self.last:
+            op, *args = self.nodes[index]
+            if op in ('true', 'false'):
+                result = index == self.TRUE
+            elif op == 'atom':
+                result = args[0] == symbol
+            elif op == 'not':
+                result = args[0] != symbol
+            elif op in ('and', 'or'):
+                memo = self.last
+                operands = (
+                    memo[arg, symbol] if (arg, symbol) in memo else self.holds_last(arg, symbol) for arg in args[0]
+                )
+                result = all(operands) if op == 'and' else any(operands)
+            elif op in ('next', 'wnext'):
+                result = op == 'wnext'
+            elif op in ('until', 'release'):
+                result = self.holds_last(args[1], symbol)
+            else:
+                result = self.holds_last(args[0], symbol)
+            self.last[key] = result
+        return self.last[key]
+
+    def find_witness(self, root: int, alphabet: frozenset) -> list:
+        """Return a shortest trace satisfying root, or None when root is unsatisfiable.
+
+        Progression states are explored breadth-first and the search stops at the
+        first state that can end the trace.
+        """
+        symbols = sorted(alphabet)
+        parents = {root: None}
+        queue = deque([root])
+        profile_count('witness_searches')
+        try:
+            while queue:
+                state = queue.popleft()
+                for symbol in symbols:
+                    if self.holds_last(state, symbol):
+                        trace = [symbol]
+                        while parents[state] is not None:
+                            state, previous = parents[state]
+                            trace.append(previous)
+                        return trace[::-1]
+                for symbol in symbols:
+                    successor = self.progress(state, symbol)
+                    if successor != self.FALSE and successor not in parents:
+                        parents[successor] = (state, symbol)
+                        queue.append(successor)
+            return None
+        finally:
+            profile_count('witness_states', len(parents))
+
+    def to_dfa(self, root: int, alphabet: frozenset) -> ArrayDFA:
+        """Build the minimal DFA of root over alphabet, for non-empty traces.
+
+        A state pairs what must hold from the next event on with whether the trace
+        read so far satisfies root, which holds_last decides when reading its last
+        event; the initial state stands for the empty trace and rejects.
+        """
+        symbols = sorted(alphabet)
+        initial = (root, False)
+        transitions = {}
+        pending = [initial]
+        while pending:
+            state = pending.pop()
+            if state in transitions:
+                continue
+            transitions[state] = {
+                symbol: (self.progress(state[0], symbol), self.holds_last(state[0], symbol)) for symbol in symbols
+            }
+            pending.extend(target for target in transitions[state].values() if target not in transitions)
+        final_states = [state for state in transitions if state[1]]
+        return ArrayDFA.from_transitions(alphabet, transitions, initial, final_states).minify()
+
+
+def check_model_progression(ltlf_formulas: list, task_timeout: float = None, expires_at: float = None,
+                            seeds: list = None) -> tuple:
+    """check_model by formula progression on a FormulaTable, without MONA or automata.
+
+    The model is satisfiable iff the conjunction of its constraints has a witness,
+    and a constraint is redundant iff the other constraints together with its
+    negation have none. That search first runs within the constraint's component
+    (see find_constraint_components), whose states are far fewer, and only a
+    witness found there is confirmed on the whole model; constraints decided by
+    find_subsumed_constraints or given in seeds are not searched. Each check runs
+    under task_timeout, and expires_at bounds the whole analysis as in check_model,
+    with the smallest components searched first.
+
+    Returns check_model's tuple plus a shortest witness trace of the model in
+    activity names (OTHER_SYMBOL standing for any other activity), or None when the
+    model is unsatisfiable or its satisfiability was not decided in time.
+    """
+    if not ltlf_formulas:
+        return True, [], [], [], []
+
+    with profile_phase('parse'):
+        parser = LTLfParser()
+        parsed_formulas = [parser(item['formula'].replace("[!]", "")) for item in ltlf_formulas]
+        alphabet = get_model_alphabet(parsed_formulas)
+        table = FormulaTable()
+        roots = [table.from_ltlf(parsed_formula) for parsed_formula in parsed_formulas]
+
+    try:
+        with task_deadline(time_left(expires_at, task_timeout)), profile_phase('satisfiability'):
+            witness = table.find_witness(table.conjunction(*roots), alphabet)
+    except TaskTimeout:
+        return None, [], format_constraints(ltlf_formulas), [], None
+    if witness is None:
+        return False, [], [], [], None
+
+    activity_names = {}
+    for item in ltlf_formulas:
+        for act in item['activities']:
+            name = Utils.parse_activity(format_activity_name(act))
+            activity_names.setdefault(name, act)
+            activity_names.setdefault(f"con_{name}", act)
+    witness = [activity_names.get(symbol, symbol) for symbol in witness]
+
+    with profile_phase('subsumption'):
+        subsumed = find_subsumed_constraints(ltlf_formulas)
+    profile_count('subsumed', sum(implying is not None for implying in subsumed))
+    seeds = seeds or [None] * len(ltlf_formulas)
+    verdicts = list(seeds)
+    for component in sorted(find_constraint_components(ltlf_formulas), key=len):
+        component_alphabet = get_model_alphabet([parsed_formulas[index] for index in component])
+        for index in component:
+            if subsumed[index] is not None or seeds[index] is not None or deadline_passed(expires_at):
+                continue
+            negated = table.negate(roots[index])
+            try:
+                with task_deadline(time_left(expires_at, task_timeout)), profile_phase('redundancy'):
+                    # Exhausting the component's own states is enough to show redundancy;
+                    # the whole model is only searched for a witness of the opposite
+                    local = table.conjunction(*[roots[other] for other in component if other != index], negated)
+                    verdict = table.find_witness(local, component_alphabet) is None
+                    if not verdict:
+                        others = table.conjunction(*roots[:index], *roots[index + 1:], negated)
+                        verdict = table.find_witness(others, alphabet) is None
+                    verdicts[index] = verdict
+            except TaskTimeout:
+                pass
+
+    return (True, *collect_verdicts(ltlf_formulas, verdicts, subsumed, 'progression', seeds), witness)
+
+
+ENGINES = ('mona', 'progression')
+
+
+DEFAULT_RESULT_STORE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'ltlf_checker', 'results.sqlite')
+DEFAULT_RESULT_STORE_MB = 64
+DEFAULT_RESULT_STORE_SEEDS = 8
+
+# Bump whenever a change to the analysis would change stored results
+RESULT_STORE_VERSION = 2
+
+# Result fields that describe one run rather than the model
+TRANSIENT_RESULT_FIELDS = ('timestamp', 'dfa_cache', 'result_store')
+
+
+def constraint_fingerprint(template_name: str, activities: list) -> tuple:
+    """Identity of a constraint, blind to the spelling that format_activity_name drops."""
+    return template_name, tuple(format_activity_name(act) for act in activities)
+
+
+def model_fingerprint(constraints: list) -> tuple:
+    """Canonical form of a model: its deduplicated, sorted constraint fingerprints.
+
+    constraints holds the (template, activities) pairs of parse_declare_constraint,
+    so the same constraint set listed in any order has the same fingerprint.
+    """
+    return tuple(sorted({constraint_fingerprint(template_name, activities)
+                         for template_name, activities in constraints}))
+
+
+class ResultStore(SQLiteLRUStore):
+    """Persistent, size-bounded LRU store of complete analysis results.
+
+    Results are keyed by the model_fingerprint of the analyzed model and the
+    engine. Along with a result the store indexes the verdict it proved for every
+    constraint, so that stored models which are a subset or a superset of a new
+    model can seed its analysis (see seeds).
+    """
+
+    table = 'model_results'
+    dependent_tables = ('model_result_constraints',)
+    schema = (
+        'CREATE TABLE IF NOT EXISTS model_results ('
+        'key TEXT PRIMARY KEY, version INTEGER NOT NULL, constraint_count INTEGER NOT NULL, '
+        'satisfiable INTEGER NOT NULL, verdicts TEXT NOT NULL, result TEXT NOT NULL, '
+        'size INTEGER NOT NULL, last_used REAL NOT NULL)',
+        'CREATE TABLE IF NOT EXISTS model_result_constraints ('
+        'key TEXT NOT NULL, fingerprint TEXT NOT NULL, PRIMARY KEY (key, fingerprint))',
+        'CREATE INDEX IF NOT EXISTS model_results_last_used ON model_results (last_used)',
+        'CREATE INDEX IF NOT EXISTS model_result_constraints_fingerprint ON model_result_constraints (fingerprint)',
+    )
+
+    def __init__(self, path: str = DEFAULT_RESULT_STORE_PATH,
+                 max_bytes: int = DEFAULT_RESULT_STORE_MB * 1024 * 1024, max_seeds: int = DEFAULT_RESULT_STORE_SEEDS):
+        super().__init__(path, max_bytes)
+        self.max_seeds = max_seeds
+
+    @staticmethod
+    def make_key(fingerprint: tuple, engine: str) -> str:
+        return hashlib.sha256(json.dumps([RESULT_STORE_VERSION, engine, fingerprint]).encode('utf-8')).hexdigest()
+
+    def get(self, fingerprint: tuple, engine: str):
+        """Return the stored result of a model fingerprint and engine, or None."""
+        key = self.make_key(fingerprint, engine)
+        row = self.connection.execute('SELECT result FROM model_results WHERE key = ?', (key,)).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.touch(key)
+        return json.loads(row[0])
+
+    def put(self, fingerprint: tuple, engine: str, result: dict) -> None:
+        """Store a complete result and evict least recently used entries over the size bound."""
+        key = self.make_key(fingerprint, engine)
+        blob = json.dumps({name: value for name, value in result.items() if name not in TRANSIENT_RESULT_FIELDS})
+        verdicts = json.dumps({
+            json.dumps(constraint_fingerprint(decision['template'], decision['activities'])): decision['redundant']
+            for decision in result['decisions']
+        })
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO model_results '
+                '(key, version, constraint_count, satisfiable, verdicts, result, size, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, RESULT_STORE_VERSION, len(fingerprint), bool(result['satisfiable']), verdicts, blob,
+                 len(blob) + len(verdicts), time.time())
+            )
+            self.connection.execute('DELETE FROM model_result_constraints WHERE key = ?', (key,))
+            self.connection.executemany(
+                'INSERT INTO model_result_constraints (key, fingerprint) VALUES (?, ?)',
+                [(key, json.dumps(constraint)) for constraint in fingerprint]
+            )
+            self.connection.execute('COMMIT')
+        except Exception:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.evict()
+
+    def seeds(self, fingerprint: tuple) -> tuple:
+        """Facts about a model proved by stored analyses of its subsets and supersets.
+
+        A constraint redundant in a subset model stays redundant once constraints
+        are added, and an unsatisfiable subset makes the model unsatisfiable; a
+        constraint non-redundant in a superset model stays non-redundant once
+        constraints are removed. Both hold whichever engine produced the result.
+        Only the max_seeds most recently used related models are consulted.
+
+        Returns (satisfiable, verdicts): satisfiable is False when a stored subset
+        is unsatisfiable and None otherwise, and verdicts maps JSON-encoded
+        constraint fingerprints to True (redundant) or False.
+        """
+        rows = self.connection.execute(
+            'SELECT r.constraint_count, r.satisfiable, r.verdicts, COUNT(*) AS shared '
+            'FROM model_result_constraints c JOIN model_results r ON r.key = c.key '
+            'WHERE c.fingerprint IN (SELECT value FROM json_each(?)) AND r.version = ? '
+            'GROUP BY r.key HAVING shared = r.constraint_count OR shared = ? '
+            'ORDER BY r.last_used DESC LIMIT ?',
+            (json.dumps([json.dumps(constraint) for constraint in fingerprint]), RESULT_STORE_VERSION,
+             len(fingerprint), self.max_seeds)
+        ).fetchall()
+
+        verdicts = {}
+        for constraint_count, satisfiable, stored_verdicts, shared in rows:
+            stored_verdicts = json.loads(stored_verdicts)
+            if shared == constraint_count:
+                if not satisfiable:
+                    return False, {}
+                verdicts.update({constraint: True for constraint, redundant in stored_verdicts.items() if redundant})
+            if shared == len(fingerprint) and satisfiable:
+                verdicts.update({
+                    constraint: False for constraint, redundant in stored_verdicts.items() if not redundant
+                })
+        return None, verdicts
+
+
+def build_ltlf_formulas(model_constraints: list) -> tuple:
+    """Turn Declare constraint lines into ltlf_formulas items.
+
+    Returns the items of the constraints create_ltl_formula supports, the
+    (template, activities) pairs of every parsed constraint, with template aliases
+    resolved, and the constraints it rejects together with the reason.
+    """
+    ltl_formulas = []
+    constraints = []
+    unsupported = []
+ 
+    # Process each constraint
+    for constraint in model_constraints:
+        template_name, activities, *_ = parse_declare_constraint(constraint)
+        
+        if not template_name:
+            continue
+        template_name = TEMPLATE_ALIASES.get(template_name, template_name)
+        constraints.append((template_name, activities))
+        
+        # Create LTL formula using template
+        try:
+            constraint_model = create_ltl_formula(template_name, activities)
+        except ValueError as e:
+            unsupported.append({'template': template_name, 'activities': activities, 'error': str(e)})
+            continue
+
+        ltl_formulas.append({
+            'template': template_name,
+            'activities': activities,
+            'formula': constraint_model.formula
+        })
+
+    return ltl_formulas, constraints, unsupported
+
+
+def analysis_result(is_satisfiable, redundant_cons: list, unchecked_cons: list, decisions: list, engine: str) -> dict:
+    """Assemble the result of an analysis from check_model's tuple."""
+    non_redundant_cons = format_constraints([decision for decision in decisions if not decision['redundant']])
+    return {
+        "success": True,
+        "redundant": str(redundant_cons),
+        "non_redundant": non_redundant_cons,
+        "unchecked": unchecked_cons,
+        "decisions": decisions,
+        "redundancy_checked": bool(is_satisfiable),
+        "satisfiable": is_satisfiable,
+        "complete": is_satisfiable is not None and not unchecked_cons,
+        "engine": engine,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def analyze_declare_model(model_path: str, dfa_cache: DFACache = None, workers: int = 1,
+                          task_timeout: float = None, pool=None, engine: str = 'mona',
+                          deadline: float = None, result_store: ResultStore = None, state_path: str = None,
+                          model_text: str = None, model_cache: ModelCache = None) -> dict:
+    """
+    Analyze a Declare model and check its satisfiability
+
+    With a deadline in seconds, the analysis stops checking once it is spent and
+    reports what it proved so far; "complete" tells whether anything was left undecided.
+    With a result_store, a model analyzed before (in any constraint order) is answered
+    from the store, and complete results are stored; "result_store" reports a "hit",
+    a "miss" or an analysis "seeded" with verdicts of stored related models.
+    With a state_path, the compiled automata are saved there for
+    reanalyze_declare_model; this needs the mona engine and bypasses the result
+    store, whose results carry no automata.
+    With model_text, the model is parsed from that text instead of model_path;
+    URLs are downloaded through model_cache (see download_model).
+    """
+    expires_at = time.monotonic() + deadline if deadline else None
+    cache_before = dfa_cache.stats() if dfa_cache is not None else None
+    try:       
+        # Parse Declare model, downloading it if it's a URL
+        with profile_phase('load'):
+            declare_model = load_declare_model(model_path, model_text, model_cache)
+        
+        # Get activities and constraints
+        model_activities = declare_model.get_model_activities()
+        model_constraints = declare_model.get_decl_model_constraints()
+        with profile_phase('formulas'):
+            ltl_formulas, constraints, unsupported = build_ltlf_formulas(model_constraints)
+        profile_count('constraints', len(constraints))
+
+        if state_path is not None and engine != 'mona':
+            raise ValueError('Saving the analysis state requires the mona engine')
+
+        # A repeated constraint is redundant through its copy, which the deduplicated
+        # fingerprint cannot tell, so such models bypass the result store
+        fingerprint = model_fingerprint(constraints)
+        if len(fingerprint) < len(constraints) or state_path is not None:
+            result_store = None
+
+        seed_satisfiable, seeds, store_status = None, None, None
+        if result_store is not None:
+            with profile_phase('result_store'):
+                stored = result_store.get(fingerprint, engine)
+            if stored is not None:
+                return {**stored, "result_store": "hit", "timestamp": datetime.now().isoformat()}
+
+            with profile_phase('result_store'):
+                seed_satisfiable, seed_verdicts = result_store.seeds(fingerprint)
+            seeds = [
+                seed_verdicts.get(json.dumps(constraint_fingerprint(item['template'], item['activities'])))
+                for item in ltl_formulas
+            ]
+            seeded = seed_satisfiable is False or any(seed is not None for seed in seeds)
+            store_status = "seeded" if seeded else "miss"
+        
+        # Check satisfiability and redundancy on the same compiled model
+        witness = None
+        if seed_satisfiable is False:
+            is_satisfiable, redundant_cons, unchecked_cons, decisions = False, [], [], []
+        elif engine == 'progression':
+            with profile_phase('analysis'):
+                is_satisfiable, redundant_cons, unchecked_cons, decisions, witness = check_model_progression(
+                    ltl_formulas, task_timeout, expires_at, seeds
+                )
+        else:
+            analysis = ModelAnalysis() if state_path is not None else None
+            with profile_phase('analysis'):
+                is_satisfiable, redundant_cons, unchecked_cons, decisions = check_model(
+                    ltl_formulas, dfa_cache, workers, task_timeout, pool, expires_at, seeds, analysis
+                )
+            if analysis is not None and is_satisfiable is not None:
+                with profile_phase('save_state'):
+                    analysis.save(state_path)
+        
+        result = analysis_result(is_satisfiable, redundant_cons, unchecked_cons, decisions, engine)
+        result["unsupported"] = unsupported
+
+        if engine == 'progression':
+            result["witness"] = witness
+
+        if engine == 'mona' and dfa_cache is not None:
+            result["dfa_cache"] = {key: value - cache_before[key] for key, value in dfa_cache.stats().items()}
+
+        if result_store is not None:
+            if result["complete"]:
+                with profile_phase('result_store'):
+                    result_store.put(fingerprint, engine, result)
+            result["result_store"] = store_status
+        
+        return result
+            
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Unexpected error: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+def reanalyze_declare_model(state_path: str, added: list = (), removed: list = (), dfa_cache: DFACache = None,
+                            workers: int = 1, task_timeout: float = None, pool=None, deadline: float = None) -> dict:
+    """
+    Re-analyze a model saved by analyze_declare_model after adding and removing constraints
+
+    added and removed hold Declare constraint lines such as "Response[A, B] | | |".
+    Only the components the edit touches are rebuilt and only the leave-one-out
+    checks whose outcome is not known yet are run (see ModelAnalysis); the edited
+    analysis is saved back to state_path.
+    """
+    expires_at = time.monotonic() + deadline if deadline else None
+    try:
+        with profile_phase('load_state'):
+            analysis = ModelAnalysis.load(state_path)
+        with profile_phase('formulas'):
+            added_formulas, _, unsupported = build_ltlf_formulas(added)
+        removed_constraints = []
+        for constraint in removed:
+            template_name, activities, *_ = parse_declare_constraint(constraint)
+            if not template_name:
+                raise ValueError(f'Invalid constraint: {constraint}')
+            removed_constraints.append((TEMPLATE_ALIASES.get(template_name, template_name), activities))
+
+        owns_pool = pool is None and workers > 1
+        if owns_pool:
+            pool = multiprocessing.Pool(workers)
+        try:
+            with profile_phase('analysis'):
+                with task_deadline(time_left(expires_at)), profile_phase('edit'):
+                    analysis.edit(added_formulas, removed_constraints, dfa_cache, pool, task_timeout, expires_at)
+                with profile_phase('check'):
+                    is_satisfiable, redundant_cons, unchecked_cons, decisions = analysis.check(
+                        pool, task_timeout, expires_at
+                    )
+
+        except TaskTimeout:
+            # The edit did not finish, so nothing about the edited model is known
+            edited = [analysis.ltlf_formulas[index] for index in analysis.kept_indices(removed_constraints)]
+            is_satisfiable, redundant_cons, decisions = None, [], []
+            unchecked_cons = format_constraints(edited + added_formulas)
+        finally:
+            if owns_pool:
+                pool.terminate()
+
+        if is_satisfiable is not None:
+            with profile_phase('save_state'):
+                analysis.save(state_path)
+
+        result = analysis_result(is_satisfiable, redundant_cons, unchecked_cons, decisions, 'mona')
+        result["unsupported"] = unsupported
+        result["incremental"] = {"components": len(analysis.components), "rebuilt": analysis.rebuilt}
+        return result
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Unexpected error: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+class AnalyzerService:
+    """Warm analysis state inherited by every request of a serve-mode process."""
+
+    def __init__(self, dfa_cache: DFACache = None, workers: int = 1, task_timeout: float = None,
+                 engine: str = 'mona', deadline: float = None, result_store: ResultStore = None,
+                 model_cache: ModelCache = None):
+        self.dfa_cache = dfa_cache
+        self.result_store = result_store
+        self.model_cache = model_cache
+        self.workers = workers
+        self.task_timeout = task_timeout
+        self.engine = engine
+        self.deadline = deadline
+
+    def analyze(self, request: dict) -> dict:
+        """Analyze a request carrying either "model" (path or URL) or "model_text".
+
+        An optional "engine" overrides the service's default engine and an optional
+        "deadline" (seconds) its default deadline.
+        """
+        engine = request.get('engine', self.engine)
+        deadline = request.get('deadline', self.deadline)
+        if engine not in ENGINES:
+            return {
+                "success": False,
+                "error": f"Unknown engine: {engine}",
+                "timestamp": datetime.now().isoformat()
+            }
+
+        if request.get('model_text') is not None or request.get('model'):
+            return analyze_declare_model(
+                request.get('model'), self.dfa_cache, self.workers, self.task_timeout, None, engine, deadline,
+                self.result_store, model_text=request.get('model_text'), model_cache=self.model_cache
+            )
+
+        return {
+            "success": False,
+            "error": "Request must contain \"model\" or \"model_text\"",
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def stores(self) -> list:
+        return [store for store in (self.dfa_cache, self.result_store, self.model_cache) if store is not None]
+
+    def warm(self) -> None:
+        """Fill the in-memory caches, so that every request forked afterwards starts from them.
+
+        Loads the most recently used automata of the DFA cache and, for the mona
+        engine, builds TEMPLATE_LIBRARY for every template of TEMPLATE_REGISTRY.
+        Templates not built within task_timeout are compiled on first use.
+        """
+        if self.dfa_cache is not None:
+            self.dfa_cache.preload()
+        if self.engine == 'mona':
+            try:
+                get_template_dfas(
+                    [(template, arity) for template, (arity, _) in TEMPLATE_REGISTRY.items()], self.dfa_cache,
+                    task_timeout=self.task_timeout
+                )
+            except TaskTimeout:
+                pass
+
+    def reopen(self) -> None:
+        """Reopen the stores in a process forked to handle a request."""
+        for store in self.stores():
+            store.reopen()
+
+    def close(self) -> None:
+        for store in self.stores():
+            store.close()
+
+
+class AnalyzerRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of AnalyzerService: POST /analyze and GET /health."""
+
+    server_version = 'ltlf_checker'
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != '/health':
+            self.send_json(404, {"success": False, "error": "Not found"})
+            return
+        self.send_json(200, {"success": True, "status": "ok"})
+
+    def do_POST(self):
+        if self.path != '/analyze':
+            self.send_json(404, {"success": False, "error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError) as e:
+            self.send_json(400, {"success": False, "error": f"Invalid request: {str(e)}"})
+            return
+
+        self.send_json(200, self.server.service.analyze(request))
+
+
+class AnalyzerServerMixIn(socketserver.ForkingMixIn):
+    """Handle every request in a process forked from the warm server.
+
+    The request runs on the main thread of its process, so its per-task
+    deadlines are armed, and with --workers it gets a pool of its own, which is
+    terminated with the request. It inherits the in-memory caches the server
+    filled (see AnalyzerService.warm); automata the request adds to them are
+    lost with its process, and only the SQLite stores keep them.
+    """
+
+    def finish_request(self, request, client_address):
+        # Only called in the forked process, which must not take over serve()'s SIGTERM handling
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        self.service.reopen()
+        super().finish_request(request, client_address)
+
+
+class ForkingHTTPServer(AnalyzerServerMixIn, HTTPServer):
+    """HTTPServer handling each request in a forked process."""
+
+
+class UnixHTTPServer(AnalyzerServerMixIn, socketserver.UnixStreamServer):
+    """ForkingHTTPServer counterpart listening on a Unix domain socket.
+
+    The socket file is removed when the server closes, so that clients can tell
+    a stopped analyzer from a running one.
+    """
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        super().server_bind()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def serve(service: AnalyzerService, host: str = '127.0.0.1', port: int = 8765, socket_path: str = None) -> None:
+    """Serve analysis requests concurrently until interrupted or terminated.
+
+    The service is warmed before the server binds, so clients fall back to a
+    cold run until it listens. On shutdown the server stops accepting requests
+    and waits for the running ones, which their deadlines bound.
+    """
+    service.warm()
+    if socket_path:
+        server = UnixHTTPServer(socket_path, AnalyzerRequestHandler)
+    else:
+        server = ForkingHTTPServer((host, port), AnalyzerRequestHandler)
+    server.service = service
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    # SIGTERM shuts the server down like Ctrl-C, so that the socket file is removed
+    previous_handler = signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        server.server_close()
+        service.close()
+
+
+def list_batch_models(source: str) -> list:
+    """Expand a directory, glob pattern or manifest file into model paths and URLs.
+
+    Directories are searched recursively for .decl files; a manifest lists one
+    path or URL per line, with # starting a comment line.
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '**', '*.decl'), recursive=True))
+
+    if re.search(r'[*?[]', source):
+        return sorted(glob.glob(source, recursive=True))
+
+    with open(source) as manifest:
+        return [line.strip() for line in manifest if line.strip() and not line.lstrip().startswith('#')]
+
+
+def read_completed_models(output_path: str) -> set:
+    """Return the models already analyzed successfully in an existing JSONL output."""
+    completed = set()
+    if not output_path or not os.path.exists(output_path):
+        return completed
+
+    with open(output_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line of an interrupted run
+                continue
+            if record.get('success'):
+                completed.add(record.get('model'))
+
+    return completed
+
+
+_batch_worker = {}
+
+
+def init_batch_worker(dfa_cache_path: str, dfa_cache_bytes: int, task_timeout: float, engine: str = 'mona',
+                      deadline: float = None, result_store_path: str = None, result_store_bytes: int = None,
+                      model_cache_path: str = None, model_cache_bytes: int = None) -> None:
+    _batch_worker['dfa_cache'] = DFACache(dfa_cache_path, dfa_cache_bytes) if dfa_cache_path else None
+    _batch_worker['result_store'] = (
+        ResultStore(result_store_path, result_store_bytes) if result_store_path else None
+    )
+    _batch_worker['model_cache'] = ModelCache(model_cache_path, model_cache_bytes) if model_cache_path else None
+    _batch_worker['task_timeout'] = task_timeout
+    _batch_worker['engine'] = engine
+    _batch_worker['deadline'] = deadline
+
+
+def batch_task(model_path: str) -> dict:
+    """Pool entry point: analyze one model with the worker's own cache handle."""
+    result = analyze_declare_model(
+        model_path, _batch_worker['dfa_cache'], 1, _batch_worker['task_timeout'], engine=_batch_worker['engine'],
+        deadline=_batch_worker['deadline'], result_store=_batch_worker['result_store'],
+        model_cache=_batch_worker['model_cache']
+    )
+    return {"model": model_path, **result}
+
+
+def run_batch(source: str, output_path: str = None, dfa_cache: DFACache = None, concurrency: int = 1,
+              workers: int = 1, task_timeout: float = None, engine: str = 'mona', deadline: float = None,
+              result_store: ResultStore = None, model_cache: ModelCache = None) -> dict:
+    """Analyze every model of a batch source, streaming one JSON line per model.
+
+    Lines are written and flushed as models finish, so an interrupted run keeps its
+    progress; when output_path already holds results, the models that succeeded
+    there are skipped. With concurrency > 1, models are analyzed in parallel
+    processes that share the persistent automata cache, result store and model
+    cache, and each model runs with a single worker. deadline bounds the analysis
+    of each model, not the batch. Every process downloads over one pooled
+    session, so models fetched from the same host reuse its connections.
+    """
+    models = list_batch_models(source)
+    completed = read_completed_models(output_path)
+    pending = [model for model in models if model not in completed]
+    summary = {"models": len(models), "skipped": len(models) - len(pending), "succeeded": 0, "failed": 0}
+
+    if output_path:
+        output = open(output_path, 'a')
+        if output.tell() > 0:
+            with open(output_path, 'rb') as previous:
+                previous.seek(-1, os.SEEK_END)
+                if previous.read(1) != b'\n':
+                    output.write('\n')
+    else:
+        output = sys.stdout
+
+    def record(result: dict) -> None:
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+        summary["succeeded" if result.get("success") else "failed"] += 1
+
+    try:
+        if concurrency > 1:
+            initargs = (
+                dfa_cache.path if dfa_cache is not None else None,
+                dfa_cache.max_bytes if dfa_cache is not None else None,
+                task_timeout,
+                engine,
+                deadline,
+                result_store.path if result_store is not None else None,
+                result_store.max_bytes if result_store is not None else None,
+                model_cache.path if model_cache is not None else None,
+                model_cache.max_bytes if model_cache is not None else None,
+            )
+            with multiprocessing.Pool(concurrency, init_batch_worker, initargs) as pool:
+                for result in pool.imap_unordered(batch_task, pending):
+                    record(result)
+        else:
+            for model_path in pending:
+                result = analyze_declare_model(
+                    model_path, dfa_cache, workers, task_timeout, engine=engine, deadline=deadline,
+                    result_store=result_store, model_cache=model_cache
+                )
+                record({"model": model_path, **result})
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    return summary
+
+
+DEFAULT_LOG_BATCH_SIZE = 1000
+DEFAULT_CASE_COLUMN = 'case:concept:name'
+DEFAULT_ACTIVITY_COLUMN = 'concept:name'
+LOG_FORMATS = ('xes', 'csv')
+
+
+def xml_tag(element) -> str:
+    """Tag of an XML element without its namespace."""
+    return element.tag.rsplit('}', 1)[-1]
+
+
+def read_xes_traces(log_path: str):
+    """Yield the (case id, activities) of every trace of an XES log.
+
+    The log is parsed incrementally and every trace is dropped once read, so only
+    one trace is held in memory. Traces without a concept:name are numbered.
+    """
+    opener = gzip.open if log_path.endswith('.gz') else open
+    with opener(log_path, 'rb') as log_file:
+        context = ElementTree.iterparse(log_file, events=('start', 'end'))
+        _, root = next(context)
+        count = 0
+        for event, element in context:
+            if event != 'end' or xml_tag(element) != 'trace':
+                continue
+            case, activities = str(count), []
+            for child in element:
+                if xml_tag(child) == 'string' and child.get('key') == 'concept:name':
+                    case = child.get('value')
+                elif xml_tag(child) == 'event':
+                    activity = next(
+                        (attribute.get('value') for attribute in child if attribute.get('key') == 'concept:name'), None
+                    )
+                    if activity is not None:
+                        activities.append(activity)
+            yield case, activities
+            count += 1
+            root.clear()
+
+
+def read_csv_traces(log_path: str, case_column: str = DEFAULT_CASE_COLUMN,
+                    activity_column: str = DEFAULT_ACTIVITY_COLUMN):
+    """Yield the (case id, activities) of every case of a CSV log, one row at a time.
+
+    The events of a case must be contiguous and in trace order, as in a log sorted
+    by case and timestamp; a case that reappears later raises ValueError.
+    """
+    opener = gzip.open if log_path.endswith('.gz') else open
+    with opener(log_path, 'rt', newline='') as log_file:
+        reader = csv.DictReader(log_file)
+        missing = {case_column, activity_column} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"The log has no {', '.join(sorted(missing))} column")
+
+        seen = set()
+        case, activities = None, []
+        for row in reader:
+            if row[case_column] != case:
+                if case is not None:
+                    yield case, activities
+                case, activities = row[case_column], []
+                if case in seen:
+                    raise ValueError(f'The events of case {case} are not contiguous; sort the log by case')
+                seen.add(case)
+            activities.append(row[activity_column])
+        if case is not None:
+            yield case, activities
+
+
+def read_log_traces(log_path: str, log_format: str = None, case_column: str = DEFAULT_CASE_COLUMN,
+                    activity_column: str = DEFAULT_ACTIVITY_COLUMN):
+    """Yield the traces of an XES or CSV log, whose format defaults to its file extension."""
+    if log_format is None:
+        extension = log_path[:-len('.gz')] if log_path.endswith('.gz') else log_path
+        log_format = os.path.splitext(extension)[1].lstrip('.').lower()
+    if log_format == 'xes':
+        return read_xes_traces(log_path)
+    if log_format == 'csv':
+        return read_csv_traces(log_path, case_column, activity_column)
+    raise ValueError(f'Unknown log format: {log_format}')
+
+
+def batched(iterable, size: int):
+    """Yield lists of up to size consecutive items of iterable."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class ConformanceAutomata:
+    """Constraint automata stacked over the model alphabet, to replay a trace on all of them at once.
+
+    table[k, state, i] is the successor of state in the automaton of constraint k
+    on symbols[i] and accepting[k, state] whether the constraint holds there;
+    smaller automata are padded with unreachable states.
+    """
+
+    def __init__(self, symbols: tuple, table: np.ndarray, accepting: np.ndarray):
+        self.symbols = tuple(symbols)
+        self.table = table
+        self.accepting = accepting
+        self.columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.activity_columns = {}
+
+    @classmethod
+    def from_dfas(cls, dfas: list) -> 'ConformanceAutomata':
+        symbols = sorted(frozenset({OTHER_SYMBOL}).union(*(dfa.input_symbols for dfa in dfas)))
+        size = max((len(dfa) for dfa in dfas), default=1)
+        table = np.zeros((len(dfas), size, len(symbols)), dtype=np.int32)
+        accepting = np.zeros((len(dfas), size), dtype=bool)
+        for k, dfa in enumerate(dfas):
+            # Symbols the constraint does not mention move like OTHER_SYMBOL, as in ArrayDFA.lift
+            table[k, :len(dfa)] = dfa.table[:, [dfa.index.get(symbol, dfa.index[OTHER_SYMBOL]) for symbol in symbols]]
+            accepting[k, :len(dfa)] = dfa.accepting
+        return cls(symbols, table, accepting)
+
+    def column(self, activity: str) -> int:
+        """Column of the symbol an event of activity reads, named as the formulas' atoms."""
+        column = self.activity_columns.get(activity)
+        if column is None:
+            symbol = f"con_{Utils.parse_activity(format_activity_name(activity))}"
+            column = self.activity_columns[activity] = self.columns.get(symbol, self.columns[OTHER_SYMBOL])
+        return column
+
+    def replay(self, activities: list) -> np.ndarray:
+        """Whether every constraint holds on the non-empty trace of activities."""
+        constraints = np.arange(len(self.table))
+        states = np.zeros(len(self.table), dtype=np.int32)
+        for activity in activities:
+            states = self.table[constraints, states, self.column(activity)]
+        return self.accepting[constraints, states]
+
+
+def build_conformance_automata(ltlf_formulas: list, engine: str = 'mona', dfa_cache: DFACache = None,
+                               workers: int = 1, task_timeout: float = None) -> ConformanceAutomata:
+    """Stack the automaton of every constraint, from MONA or from formula progression (see FormulaTable.to_dfa)."""
+    parser = LTLfParser()
+    parsed_formulas = [parser(item['formula'].replace("[!]", "")) for item in ltlf_formulas]
+    if engine == 'progression':
+        table = FormulaTable()
+        dfas = [
+            table.to_dfa(table.from_ltlf(parsed_formula), get_model_alphabet([parsed_formula]))
+            for parsed_formula in parsed_formulas
+        ]
+    else:
+        pool = multiprocessing.Pool(workers) if workers > 1 else None
+        try:
+            dfas = get_constraint_dfas(ltlf_formulas, parsed_formulas, dfa_cache, pool, task_timeout)
+        finally:
+            if pool is not None:
+                pool.terminate()
+    return ConformanceAutomata.from_dfas(dfas)
+
+
+def replay_traces(automata: ConformanceAutomata, traces: list) -> list:
+    """Replay (case id, activities) traces; returns (case id, events, indices of the violated constraints).
+
+    Empty traces are not replayed, since traces are non-empty in LTLf, and get
+    None instead of the violated constraints.
+    """
+    results = []
+    for case, activities in traces:
+        if not activities:
+            results.append((case, 0, None))
+            continue
+        results.append((case, len(activities), np.flatnonzero(~automata.replay(activities)).tolist()))
+    return results
+
+
+_log_worker = {}
+
+
+def init_log_worker(automata: ConformanceAutomata) -> None:
+    _log_worker['automata'] = automata
+
+
+def log_batch_task(traces: list) -> list:
+    """Pool entry point: replay_traces on the worker's automata."""
+    return replay_traces(_log_worker['automata'], traces)
+
+
+def check_log_conformance(model_path: str, log_path: str, output_path: str = None, dfa_cache: DFACache = None,
+                          workers: int = 1, task_timeout: float = None, engine: str = 'mona',
+                          batch_size: int = DEFAULT_LOG_BATCH_SIZE, log_format: str = None,
+                          case_column: str = DEFAULT_CASE_COLUMN, activity_column: str = DEFAULT_ACTIVITY_COLUMN,
+                          model_cache: ModelCache = None) -> dict:
+    """Check every trace of an event log against a model, streaming one JSON line per trace.
+
+    Each trace is replayed on the automata of the model's constraints (see
+    ConformanceAutomata) and its line gives its events, whether it is compliant
+    and the indices of the constraints it violates, in the order of the summary's
+    "constraints". The log is read as a stream (see read_log_traces) in batches of
+    batch_size traces; with workers > 1 the batches are replayed in a process pool
+    and at most two batches per worker are in flight, so memory stays bounded
+    whatever the size of the log. Lines keep the order of the log.
+
+    Returns a summary with the trace counts and, per constraint, the number of
+    traces violating it.
+    """
+    declare_model = load_declare_model(model_path, model_cache=model_cache)
+    ltl_formulas, _, unsupported = build_ltlf_formulas(declare_model.get_decl_model_constraints())
+    automata = build_conformance_automata(ltl_formulas, engine, dfa_cache, workers, task_timeout)
+
+    violations = [0] * len(ltl_formulas)
+    summary = {"traces": 0, "compliant": 0, "violating": 0, "empty": 0, "events": 0}
+    output = open(output_path, 'w') if output_path else sys.stdout
+
+    def record(results: list) -> None:
+        for case, events, violated in results:
+            summary["traces"] += 1
+            summary["events"] += events
+            if violated is None:
+                summary["empty"] += 1
+            else:
+                summary["violating" if violated else "compliant"] += 1
+                for index in violated:
+                    violations[index] += 1
+            output.write(json.dumps({
+                "trace": case,
+                "events": events,
+                "compliant": not violated if violated is not None else None,
+                "violated": violated or []
+            }) + '\n')
+        output.flush()
+
+    traces = batched(read_log_traces(log_path, log_format, case_column, activity_column), batch_size)
+    try:
+        if workers > 1:
+            with multiprocessing.Pool(workers, init_log_worker, (automata,)) as pool:
+                pending = deque()
+                for batch in traces:
+                    pending.append(pool.apply_async(log_batch_task, (batch,)))
+                    if len(pending) >= 2 * workers:
+                        record(pending.popleft().get())
+                while pending:
+                    record(pending.popleft().get())
+        else:
+            for batch in traces:
+                record(replay_traces(automata, batch))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    summary["constraints"] = [
+        {'template': item['template'], 'activities': item['activities'], 'violations': count}
+        for item, count in zip(ltl_formulas, violations)
+    ]
+    summary["unsupported"] = unsupported
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Declare Model Analyzer')
+    parser.add_argument(
+        '--model',
+        type=str,
+        help='Path or URL to the Declare model file'
+    )
+    parser.add_argument(
+        '--json-output',
+        action='store_true',
+        help='Output in JSON format'
+    )
+    parser.add_argument(
+        '--dfa-cache',
+        type=str,
+        default=DEFAULT_DFA_CACHE_PATH,
+        help='Path of the persistent automata cache'
+    )
+    parser.add_argument(
+        '--dfa-cache-size',
+        type=int,
+        default=DEFAULT_DFA_CACHE_MB,
+        help='Maximum size of the automata cache in megabytes'
+    )
+    parser.add_argument(
+        '--no-dfa-cache',
+        action='store_true',
+        help='Compile every formula without consulting the automata cache'
+    )
+    parser.add_argument(
+        '--result-store',
+        type=str,
+        default=DEFAULT_RESULT_STORE_PATH,
+        help='Path of the persistent store of analysis results'
+    )
+    parser.add_argument(
+        '--result-store-size',
+        type=int,
+        default=DEFAULT_RESULT_STORE_MB,
+        help='Maximum size of the result store in megabytes'
+    )
+    parser.add_argument(
+        '--no-result-store',
+        action='store_true',
+        help='Analyze every model without consulting or filling the result store'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of processes used for compilation and redundancy checks'
+    )
+    parser.add_argument(
+        '--task-timeout',
+        type=float,
+        default=None,
+        help='Deadline in seconds for each compilation and leave-one-out check'
+    )
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        default=None,
+        help='Time budget in seconds for the whole analysis; when spent, the partial result is reported'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='mona',
+        help='Decide the model with MONA automata or with formula progression (no MONA, reports a witness trace)'
+    )
+    parser.add_argument(
+        '--model-cache',
+        type=str,
+        default=DEFAULT_MODEL_CACHE_PATH,
+        help='Path of the persistent cache of downloaded model files'
+    )
+    parser.add_argument(
+        '--model-cache-size',
+        type=int,
+        default=DEFAULT_MODEL_CACHE_MB,
+        help='Maximum size of the model cache in megabytes'
+    )
+    parser.add_argument(
+        '--no-model-cache',
+        action='store_true',
+        help='Download every model URL without consulting the model cache'
+    )
+    parser.add_argument(
+        '--state',
+        type=str,
+        help='File of the analysis state: written after analyzing --model, otherwise edited with --add and --remove'
+    )
+    parser.add_argument(
+        '--add',
+        action='append',
+        default=[],
+        help='Constraint to add to the model saved in --state, e.g. "Response[A, B] | | |"; repeatable'
+    )
+    parser.add_argument(
+        '--remove',
+        action='append',
+        default=[],
+        help='Constraint to remove from the model saved in --state; repeatable'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Add a "metrics" object to the result of a --model or --state analysis: time per phase, counts, '
+             'automaton sizes and peak RSS'
+    )
+    parser.add_argument(
+        '--profile-output',
+        type=str,
+        help='Also write cProfile statistics of the analysis to this file (read with pstats); implies --profile'
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run as a persistent analyzer answering POST /analyze requests'
+    )
+    parser.add_argument(
+        '--host',
+        type=str,
+        default='127.0.0.1',
+        help='Address the analyzer listens on in serve mode'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Port the analyzer listens on in serve mode'
+    )
+    parser.add_argument(
+        '--socket',
+        type=str,
+        help='Unix socket path to listen on in serve mode instead of a TCP port'
+    )
+    parser.add_argument(
+        '--batch',
+        type=str,
+        help='Directory, glob pattern or manifest file of models to analyze as JSON lines'
+    )
+    parser.add_argument(
+        '--batch-output',
+        type=str,
+        help='JSONL file to append batch results to; models already analyzed there are skipped'
+    )
+    parser.add_argument(
+        '--log',
+        type=str,
+        help='XES or CSV event log to check against --model, writing one JSON line per trace'
+    )
+    parser.add_argument(
+        '--log-format',
+        choices=LOG_FORMATS,
+        help='Format of the --log file; by default its extension (.xes, .csv, optionally .gz)'
+    )
+    parser.add_argument(
+        '--log-output',
+        type=str,
+        help='JSONL file to write the trace verdicts of --log to, instead of standard output'
+    )
+    parser.add_argument(
+        '--log-batch-size',
+        type=int,
+        default=DEFAULT_LOG_BATCH_SIZE,
+        help='Number of traces replayed per task in --log mode'
+    )
+    parser.add_argument(
+        '--case-column',
+        type=str,
+        default=DEFAULT_CASE_COLUMN,
+        help='Case id column of a CSV log, whose events must be grouped by case'
+    )
+    parser.add_argument(
+        '--activity-column',
+        type=str,
+        default=DEFAULT_ACTIVITY_COLUMN,
+        help='Activity column of a CSV log'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of models analyzed in parallel in batch mode'
+    )
+
+    try:
+        args = parser.parse_args()
+        if not (args.model or args.serve or args.batch or args.state):
+            parser.error('one of --model, --serve, --batch or --state is required')
+        if (args.add or args.remove) and (args.model or not args.state):
+            parser.error('--add and --remove edit the analysis saved in --state and exclude --model')
+        if args.log and not args.model:
+            parser.error('--log checks the log against --model, which is required')
+        if (args.profile or args.profile_output) and (args.serve or args.batch or args.log):
+            parser.error('--profile and --profile-output apply to a single --model or --state analysis')
+
+        dfa_cache = None
+        if not args.no_dfa_cache:
+            dfa_cache = DFACache(args.dfa_cache, args.dfa_cache_size * 1024 * 1024)
+
+        result_store = None
+        if not args.no_result_store:
+            result_store = ResultStore(args.result_store, args.result_store_size * 1024 * 1024)
+
+        model_cache = None
+        if not args.no_model_cache:
+            model_cache = ModelCache(args.model_cache, args.model_cache_size * 1024 * 1024)
+
+        if args.serve:
+            service = AnalyzerService(
+                dfa_cache, args.workers, args.task_timeout, args.engine, args.deadline, result_store, model_cache
+            )
+            serve(service, args.host, args.port, args.socket)
+            return
+
+        if args.log:
+            summary = check_log_conformance(
+                args.model, args.log, args.log_output, dfa_cache, args.workers, args.task_timeout, args.engine,
+                args.log_batch_size, args.log_format, args.case_column, args.activity_column, model_cache
+            )
+            print(json.dumps(summary), file=sys.stderr)
+            return
+
+        if args.batch:
+            summary = run_batch(
+                args.batch, args.batch_output, dfa_cache, args.concurrency, args.workers, args.task_timeout,
+                args.engine, args.deadline, result_store, model_cache
+            )
+            print(json.dumps(summary), file=sys.stderr)
+            return
+
+        profiler = Profiler() if args.profile or args.profile_output else None
+        with profiling(profiler, args.profile_output) if profiler is not None else nullcontext():
+            if args.model:
+                result = analyze_declare_model(
+                    args.model, dfa_cache, args.workers, args.task_timeout, engine=args.engine,
+                    deadline=args.deadline, result_store=result_store, state_path=args.state, model_cache=model_cache
+                )
+            else:
+                result = reanalyze_declare_model(
+                    args.state, args.add, args.remove, dfa_cache, args.workers, args.task_timeout,
+                    deadline=args.deadline
+                )
+        if profiler is not None:
+            result["metrics"] = profiler.metrics()
         
         if args.json_output:
             print(json.dumps(result, indent=2))
@@ -45,7 +45,38 @@ export async function calculateMetrics(fileContent, modelPath) {
 		...rest,
 	};
 
-	if (verifyModelResult.message === "Computation timed out") {
+	if (
+		verifyModelResult.satisfiable === false &&
+		verifyModelResult.redundancyChecked === false
+	) {
+		redundancy = {
+			message: "Not checked: model is inconsistent",
+			result: "",
+			redundantCount: 0,
+			redundancyChecked: false,
+		};
+	}
+
+	// A partial result whose satisfiability was decided keeps it, but its
+	// redundancy list only covers the constraints checked before the deadline
+	if (
+		verifyModelResult.complete === false &&
+		verifyModelResult.satisfiable !== null
+	) {
+		redundancy = {
+			message: `Partial result: ${verifyModelResult.uncheckedCount} constraint(s) not checked in time ⚠️`,
+			result: verifyModelResult.redundancy || "",
+			redundantCount: verifyModelResult.redundancyCount || 0,
+			complete: false,
+			uncheckedCount: verifyModelResult.uncheckedCount,
+		};
+	}
+
+	if (
+		verifyModelResult.message === "Computation timed out" ||
+		(verifyModelResult.complete === false &&
+			verifyModelResult.satisfiable === null)
+	) {
 		redundancy = {
 			message: "Computation timed out ⚠️",
 			result: "",